@@ -1,21 +1,27 @@
+import bisect
 import sys
 import time
+from collections import Counter
 
 import psutil
-import GPUtil
-import platform
 
 from PyQt5.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QTabWidget, QTextEdit, QMessageBox, QTableWidget,
-    QHBoxLayout, QLineEdit, QTableWidgetItem, QFrame
+    QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QTabWidget, QTextEdit, QMessageBox, QHBoxLayout,
+    QLineEdit, QFrame, QTableView, QHeaderView, QAbstractItemView
 )
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtCore import Qt, QEvent
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
 from stats_screen.MlInsightsScreen import TrainingSession
 from helper.gemini_helper import WorkerThread
 from helper.process_tracker import ProcessStatsTracker
+from helper.usage_reader import UsageQueryThread
+from helper.collector import CollectorThread
+from helper.gpu_provider import get_gpu_provider
+from helper.live_graph import HISTORY_SECONDS, create_live_graph
+from helper.invalidation import ViewInvalidator
+from helper.process_model import GpuProcessModel, PidNameCache, ProcessTableModel, ProcessSortProxy
 
 
 class BarPlotCanvas(FigureCanvas):
@@ -26,6 +32,22 @@ class BarPlotCanvas(FigureCanvas):
         self.setStyleSheet("background-color: #121212;")
         # Optional: initial empty plot
         self.ax.set_facecolor('#121212')
+        self.data = None
+
+    def show_data(self, data, title, xlabel, ylabel, empty_text):
+        # Result tuples are reused while their table is unchanged, so the
+        # same object means there is nothing new to draw
+        if data is self.data:
+            return
+        self.data = data
+
+        if data:
+            labels, values = zip(*data)
+            self.plot(labels, values, title, xlabel, ylabel)
+        else:
+            self.ax.clear()
+            self.ax.text(0.5, 0.5, empty_text, ha='center', va='center', color='#FFA500')
+            self.draw()
 
     def plot(self, labels, values, title, xlabel, ylabel):
         orange = '#FFA500'
@@ -47,35 +69,9 @@ class BarPlotCanvas(FigureCanvas):
         self.draw()
 
 
-# Enhanced Matplotlib Canvas
-class MplCanvas(FigureCanvas):
-    def __init__(self, parent=None):
-        self.fig = Figure(facecolor='#0a0a0a', edgecolor='#ff6600')
-        self.fig.patch.set_facecolor('#0a0a0a')
-
-        # Create subplots with custom spacing
-        self.cpu_ax = self.fig.add_subplot(311)
-        self.ram_ax = self.fig.add_subplot(312)
-        self.gpu_ax = self.fig.add_subplot(313)
-
-        # Style the axes
-        for ax in [self.cpu_ax, self.ram_ax, self.gpu_ax]:
-            ax.set_facecolor('#1a1a1a')
-            ax.tick_params(colors='#ff6600', labelsize=8)
-            ax.spines['bottom'].set_color('#ff6600')
-            ax.spines['top'].set_color('#ff6600')
-            ax.spines['right'].set_color('#ff6600')
-            ax.spines['left'].set_color('#ff6600')
-            ax.grid(True, alpha=0.2, color='#ff6600')
-
-        super().__init__(self.fig)
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #0a0a0a;
-                border: 2px solid #ff6600;
-                border-radius: 8px;
-            }
-        """)
+def _top_names(ranking, reading):
+    """'name (reading), ...' for a ranking, or 'N/A' when it is empty."""
+    return ', '.join(f"{proc.name} ({reading(proc)})" for proc in ranking) or 'N/A'
 
 
 # Main Application Window
@@ -85,6 +81,8 @@ class SystemMonitor(QWidget):
 
         #Intializing Process Tracker
         self.process_tracker = ProcessStatsTracker()
+        self.usage_reader = UsageQueryThread(self.process_tracker)
+        self.pid_names = PidNameCache()
         self.setWindowTitle("◉ InsightOS")
         self.setGeometry(100, 100, 1200, 900)
 
@@ -119,23 +117,40 @@ class SystemMonitor(QWidget):
         self.cpu_usage = []
         self.ram_usage = []
         self.gpu_usage = []
-        self.time_counter = list(range(30))
+        self.sample_times = []
 
         # ML session variables
         self.active_session = None
         self.sessions = []
 
-        # Timer for updates
-        self.timer = QTimer()
-        self.timer.setInterval(1000)
-        self.timer.timeout.connect(self.update_all)
-        self.timer.start()
+        # Background collector; the GUI thread only renders the snapshots it emits
+        self.latest_snapshot = None
+        self.data_versions = Counter()  # snapshots each collector has contributed to
+        self.collector = CollectorThread(interval=1.0)
+        self.collector.snapshot_ready.connect(self.update_all)
+        self.tab_keys = {
+            self.process_tab: 'processes', self.graph_tab: 'graphs', self.gaming_tab: 'gaming',
+            self.ml_tab: 'ml', self.spec_tab: 'specs', self.usage_tab: 'usage',
+        }
 
-        # Initialize tabs
-        self.show_specs()
-        self.show_top_processes()
-        self.show_gaming_stats()
-        self.update_gpu_info()
+        # Tabs render only while visible and only when their data moved on
+        self.views = ViewInvalidator()
+        self.views.add('processes', lambda: self.snapshot_version('processes'),
+                       lambda: self.show_top_processes(self.latest_snapshot))
+        self.views.add('graphs', lambda: self.snapshot_version('cpu'), self.draw_graphs)
+        self.views.add('gaming', lambda: self.snapshot_version('gpu'),
+                       lambda: self.show_gaming_stats(self.latest_snapshot))
+        self.views.add('ml', lambda: self.snapshot_version('gpu'),
+                       lambda: self.update_gpu_info(self.latest_snapshot))
+        self.views.add('specs', lambda: self.snapshot_version('specs', 'cpu_freq', 'disk'),
+                       lambda: self.show_specs(self.latest_snapshot))
+        # Queries run on the usage reader's thread; on_usage_results draws them
+        self.views.add('usage', self.usage_reader.data_version, self.usage_reader.request)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        self.on_tab_changed(self.tabs.currentIndex())
+        self.usage_reader.results_ready.connect(self.on_usage_results)
+        self.usage_reader.start()
+        self.collector.start()
 
     def get_main_stylesheet(self):
         return """
@@ -208,7 +223,12 @@ class SystemMonitor(QWidget):
         layout = QHBoxLayout()
         title = QLabel("◉ InsightOS")
         title.setAlignment(Qt.AlignCenter)
-        layout.addWidget(title)
+        layout.addWidget(title, 1)
+
+        # Effective sampling interval chosen by the adaptive collector
+        self.rate_label = QLabel("⏱ --")
+        self.rate_label.setStyleSheet("font-size: 12px; font-weight: bold;")
+        layout.addWidget(self.rate_label)
         header.setLayout(layout)
 
         return header
@@ -234,22 +254,49 @@ class SystemMonitor(QWidget):
         """)
         layout.addWidget(title)
 
-        self.process_text = QTextEdit()
-        self.process_text.setReadOnly(True)
-        self.process_text.setStyleSheet("""
-            QTextEdit {
+        # Every live process; the model applies per-row diffs each tick and the
+        # view only paints the rows scrolled into sight
+        self.process_model = ProcessTableModel(self)
+        self.process_proxy = ProcessSortProxy(self.process_model, self)
+        self.process_view = QTableView()
+        self.process_view.setModel(self.process_proxy)
+        self.process_view.setSortingEnabled(True)
+        self.process_view.sortByColumn(2, Qt.DescendingOrder)
+        self.process_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.process_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.process_view.setShowGrid(False)
+        self.process_view.setWordWrap(False)
+        # Fixed row heights and column widths, so nothing measures all rows
+        self.process_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.process_view.verticalHeader().setDefaultSectionSize(24)
+        self.process_view.verticalHeader().hide()
+        header = self.process_view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        self.process_view.setStyleSheet("""
+            QTableView {
                 background-color: #1a1a1a;
                 color: #ffffff;
                 font-family: 'Consolas', 'Monaco', monospace;
                 font-size: 12px;
                 border: 2px solid #ff6600;
                 border-radius: 8px;
-                padding: 10px;
                 selection-background-color: #ff6600;
                 selection-color: #000000;
             }
+            QHeaderView::section {
+                background-color: #ff6600;
+                color: #000000;
+                font-weight: bold;
+                padding: 6px;
+                border: none;
+            }
         """)
-        layout.addWidget(self.process_text)
+        layout.addWidget(self.process_view)
+
+        self.process_summary = QLabel()
+        self.process_summary.setStyleSheet("color: #ff6600; font-size: 12px; padding: 4px;")
+        layout.addWidget(self.process_summary)
 
         self.process_tab.setLayout(layout)
         self.tabs.addTab(self.process_tab, "⚡ Processes")
@@ -275,7 +322,7 @@ class SystemMonitor(QWidget):
         """)
         layout.addWidget(title)
 
-        self.canvas = MplCanvas(self)
+        self.canvas = create_live_graph(parent=self)
         layout.addWidget(self.canvas)
 
         self.graph_tab.setLayout(layout)
@@ -589,11 +636,16 @@ class SystemMonitor(QWidget):
         proc_label.setStyleSheet("color: #ff6600; font-weight: bold; font-size: 14px;")
         layout.addWidget(proc_label)
 
-        self.process_table = QTableWidget()
-        self.process_table.setColumnCount(3)
-        self.process_table.setHorizontalHeaderLabels(["PID", "Name", "GPU Memory (MB)"])
+        # Diffed by pid each refresh; names are resolved once per process
+        self.gpu_process_model = GpuProcessModel(self.pid_names, self)
+        self.process_table = QTableView()
+        self.process_table.setModel(self.gpu_process_model)
+        self.process_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.process_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.process_table.verticalHeader().hide()
+        self.process_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.process_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #1a1a1a;
                 color: #ffffff;
                 border: 2px solid #ff6600;
@@ -609,7 +661,7 @@ class SystemMonitor(QWidget):
                 padding: 8px;
                 border: none;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
                 border-bottom: 1px solid #333333;
             }
@@ -679,6 +731,29 @@ class SystemMonitor(QWidget):
         self.history_canvas = BarPlotCanvas()
         layout.addWidget(self.history_canvas)
 
+        # Title Peak memory, read from the rollup tiers
+        title_memory = QLabel("🎮 Peak Memory (last 24 h)")
+        title_memory.setStyleSheet("""
+                              QLabel {
+                                  color: #ff6600;
+                                  font-size: 18px;
+                                  font-weight: bold;
+                                  padding: 10px;
+                                  background-color: #1a1a1a;
+                                  border: 2px solid #ff6600;
+                                  border-radius: 8px;
+                              }
+                          """)
+        layout.addWidget(title_memory)
+
+        self.memory_canvas = BarPlotCanvas()
+        layout.addWidget(self.memory_canvas)
+
+        # Database writer backpressure
+        self.writer_label = QLabel("💾 --")
+        self.writer_label.setStyleSheet("color: #FFA500; font-size: 12px;")
+        layout.addWidget(self.writer_label)
+
         self.usage_tab.setLayout(layout)
         self.tabs.addTab(self.usage_tab, "📈 Usage")
 
@@ -773,17 +848,17 @@ class SystemMonitor(QWidget):
         self.model_name_input.setEnabled(True)
         self.active_session_label.setText("No active training session.")
 
-    def update_gpu_info(self):
+    def update_gpu_info(self, snapshot):
         try:
-            gpus = GPUtil.getGPUs()
+            gpus = snapshot.gpus
             if not gpus:
                 self.active_session_label.setText("❌ No GPU detected.")
-                self.process_table.setRowCount(0)
+                self.gpu_process_model.apply(())
                 return
 
             gpu = gpus[0]
-            load = gpu.load * 100
-            memory_used = gpu.memoryUsed
+            load = gpu.load_percent
+            memory_used = gpu.memory_used_mb
 
             # Update active session peaks
             if self.active_session:
@@ -806,138 +881,71 @@ class SystemMonitor(QWidget):
 
     def update_process_table(self, gpu):
         try:
-            if hasattr(gpu, 'processes') and gpu.processes:
-                procs = gpu.processes
-                self.process_table.setRowCount(len(procs))
-                for i, proc in enumerate(procs):
-                    pid = proc.get('pid', 'N/A')
-                    mem_used = proc.get('used_memory', 0)
-                    try:
-                        p = psutil.Process(int(pid)) if pid != 'N/A' else None
-                        name = p.name() if p else "N/A"
-                    except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
-                        name = "N/A"
-
-                    self.process_table.setItem(i, 0, QTableWidgetItem(str(pid)))
-                    self.process_table.setItem(i, 1, QTableWidgetItem(name))
-                    self.process_table.setItem(i, 2, QTableWidgetItem(f"{mem_used:.0f}"))
-            else:
-                self.process_table.setRowCount(0)
+            self.gpu_process_model.apply(gpu.processes)
         except Exception as e:
             print(f"Error updating process table: {e}")
-            self.process_table.setRowCount(0)
-
-    def update_all_charts(self):
-        current_data = self.process_tracker.fetch_current_day_stats()
-        if current_data:
-            labels, values = zip(*current_data)
-            self.current_canvas.plot(labels, values, 'Current Day Usage', 'Processes', 'Time in Top 5 (s)')
-        else:
-            self.current_canvas.ax.clear()
-            self.current_canvas.ax.text(0.5, 0.5, "No current day data available.", ha='center', va='center',
-                                        color='#FFA500')
-            self.current_canvas.draw()
-
-        overall_data = self.process_tracker.fetch_overall_stats()
-        if overall_data:
-            labels, values = zip(*overall_data)
-            self.overall_canvas.plot(labels, values, 'Overall Usage', 'Processes', 'Time in Top 5 (s)')
-        else:
-            self.overall_canvas.ax.clear()
-            self.overall_canvas.ax.text(0.5, 0.5,   "No overall stats data available.", ha='center', va='center',
-                                        color='#FFA500')
-            self.overall_canvas.draw()
-
-        history_data = self.process_tracker.fetch_daily_history_stats()
-        if history_data:
-            labels, values = zip(*history_data)
-            self.history_canvas.plot(labels, values, 'Last 10 Days Usage', 'Date', 'Usage Time (s)')
-        else:
-            self.history_canvas.ax.clear()
-            self.history_canvas.ax.text(0.5, 0.5, "No history summary data available.", ha='center', va='center',
-                                        color='#FFA500')
-            self.history_canvas.draw()
-
-    def show_gaming_stats(self):
-        gpus = GPUtil.getGPUs()
+            self.gpu_process_model.apply(())
+
+    def on_usage_results(self, results):
+        self.current_canvas.show_data(results['current'], 'Current Day Usage', 'Processes', 'Time in Top 5 (s)',
+                                      "No current day data available.")
+        self.overall_canvas.show_data(results['overall'], 'Overall Usage', 'Processes', 'Time in Top 5 (s)',
+                                      "No overall stats data available.")
+        self.history_canvas.show_data(results['history'], 'Last 10 Days Usage', 'Date', 'Usage Time (s)',
+                                      "No history summary data available.")
+        self.memory_canvas.show_data(results['memory'], 'Peak Memory (last 24 h)', 'Processes', 'Memory (MB)',
+                                     "No memory history available yet.")
+
+        stats = self.process_tracker.writer_stats()
+        reads = self.usage_reader.stats()
+        self.writer_label.setText(
+            f"💾 queue {stats['queue_depth']} (max {stats['max_depth']}) | "
+            f"rows written {stats['rows_written']} | pending {stats['pending_rows']} | "
+            f"coalesced {stats['coalesced_rows']} | dropped {stats['dropped_rows']} | "
+            f"rejected jobs {stats['rejected_jobs']} | errors {stats['errors']} | "
+            f"tracked {stats['tracked_processes']} | "
+            f"query cache {stats['cache_hits']}/{stats['cache_hits'] + stats['cache_misses']} hits | "
+            f"query latency {reads['last_ms']:.1f} ms (avg {reads['avg_ms']:.1f}) | "
+            f"cancelled {reads['cancelled']}")
+
+    def show_gaming_stats(self, snapshot):
+        gpus = snapshot.gpus
         if not gpus:
             self.gaming_text.setText("No GPU detected.")
             return
 
         gpu = gpus[0]  # Assume first GPU for now
-        fps_estimate = int((1 - gpu.load) * 144)  #  FPS estimate for demo
+        fps_estimate = int((1 - gpu.load_percent / 100) * 144)  #  FPS estimate for demo
 
         text = f""" 🔥 GPU : {gpu.name}
-    💾 Total Memory: {gpu.memoryTotal:.0f} MB
+    💾 Total Memory: {gpu.memory_total_mb:.0f} MB
     🌡️  Temperature: {gpu.temperature}°C
-    ⚡ Driver Version: {getattr(gpu, 'driver', 'N/A')}
-    🔌 GPU Load: {gpu.load * 100:.1f}%
+    ⚡ Driver Version: {gpu.driver}
+    🔌 GPU Load: {gpu.load_percent:.1f}%
     fps : {fps_estimate}fps 
-    💿 Memory Used: {gpu.memoryUsed:.0f} MB / {gpu.memoryTotal:.0f} MB
+    💿 Memory Used: {gpu.memory_used_mb:.0f} MB / {gpu.memory_total_mb:.0f} MB
     """
 
         self.gaming_stats_text.setText(text)
 
-    def show_top_processes(self):
-            try:
-                processes = []
-                for proc in psutil.process_iter(['pid', 'name', 'memory_info', 'cpu_percent']):
-                    try:
-                        mem_mb = proc.info['memory_info'].rss / 1024 / 1024
-                        processes.append((
-                            proc.info['pid'],
-                            proc.info['name'],
-                            mem_mb,
-                            proc.info['cpu_percent']
-                        ))
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
-
-                # Sort by combined CPU and memory usage
-                processes.sort(key=lambda x: (x[3] + x[2] / 100), reverse=True)
-
-                display_text = f"""
-    🔥 TOP SYSTEM PROCESSES
-    {'═' * 70}
-
-    {'PID':<10}{'PROCESS NAME':<25}{'RAM (MB)':<12}{'CPU (%)':<10}{'STATUS':<8}
-    {'-' * 70}
-    """
-
-                for i, proc in enumerate(processes[:15], 1):
-                    # Determine status based on resource usage
-                    if proc[3] > 50 or proc[2] > 500:
-                        status = "🔴 HIGH"
-                    elif proc[3] > 20 or proc[2] > 200:
-                        status = "🟡 MED"
-                    else:
-                        status = "🟢 LOW"
-
-                    rank_icon = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i:2d}."
-
-                    display_text += f"{rank_icon} {proc[0]:<8}{proc[1]:<25}{proc[2]:<12.1f}{proc[3]:<10.1f}{status}\n"
-
-                # Add system summary
-                cpu_count = psutil.cpu_count()
-                memory = psutil.virtual_memory()
-
-                display_text += f"""
-    {'-' * 70}
-    📊 SYSTEM SUMMARY:
-    • Total Processes: {len(processes)}
-    • CPU Cores: {cpu_count} 
-    • Total RAM: {memory.total / (1024 ** 3):.1f} GB
-    • Available RAM: {memory.available / (1024 ** 3):.1f} GB
-    • System Load: {psutil.getloadavg()[0] if hasattr(psutil, 'getloadavg') else 'N/A'}
-    """
+    def show_top_processes(self, snapshot):
+        try:
+            self.process_model.apply(snapshot.processes)
 
-                self.process_text.setText(display_text)
+            memory = snapshot.memory
+            self.process_summary.setText(
+                f"📊 Processes: {len(snapshot.processes)} | CPU Cores: {snapshot.cpu_count} | "
+                f"Total RAM: {memory.total / (1024 ** 3):.1f} GB | "
+                f"Available RAM: {memory.available / (1024 ** 3):.1f} GB | "
+                f"System Load: {snapshot.load_avg[0] if snapshot.load_avg else 'N/A'}\n"
+                f"🔥 Top CPU: {_top_names(snapshot.rankings['cpu'], lambda p: f'{p.cpu_percent:.1f}%')} | "
+                f"💾 Top I/O: {_top_names(snapshot.rankings['io'], lambda p: f'{p.io_rate / 1024 ** 2:.1f} MB/s')}")
 
-            except Exception as e:
-                self.process_text.setText(f"❌ Error retrieving process information: {str(e)}")
+        except Exception as e:
+            self.process_summary.setText(f"❌ Error retrieving process information: {str(e)}")
 
-    def show_specs(self):
-        self.spec_text.setText(self.get_system_info())
+    def show_specs(self, snapshot):
+        self.spec_text.setText(self.get_system_info(snapshot))
 
     # Gaming Mode Methods
     def on_ask_button_clicked(self):
@@ -945,25 +953,33 @@ class SystemMonitor(QWidget):
         if not user_question:
             QMessageBox.warning(self, "Input Error", "Please enter your question.")
             return
-        gpus = GPUtil.getGPUs()
+        gpus = self.latest_snapshot.gpus if self.latest_snapshot else ()
         if not gpus:
             self.gaming_text.setText("No GPU detected.")
             return
 
         gpu = gpus[0]  # Assume first GPU for now
-        fps_estimate = int((1 - gpu.load) * 144)  # Naive FPS estimate for demo
+        fps_estimate = int((1 - gpu.load_percent / 100) * 144)  # Naive FPS estimate for demo
 
         gpu_condition = (
             f"🎮 Gaming Performance Stats\n"
             f"{'-' * 40}\n"
             f"GPU: {gpu.name}\n"
             f"Temperature: {gpu.temperature}°C\n"
-            f"Memory Used: {gpu.memoryUsed:.0f}MB / {gpu.memoryTotal:.0f}MB\n"
-            f"GPU Load: {gpu.load * 100:.2f}%\n"
+            f"Memory Used: {gpu.memory_used_mb:.0f}MB / {gpu.memory_total_mb:.0f}MB\n"
+            f"GPU Load: {gpu.load_percent:.2f}%\n"
             f"Estimated FPS: {fps_estimate} FPS (approx)\n"
             f"{'-' * 40}\n\n"
             f"Top Resource-Heavy Processes:\n"
         )
+        rankings = self.latest_snapshot.rankings
+        for proc in rankings['combined']:
+            gpu_condition += f"{proc.name} (PID {proc.pid}): CPU {proc.cpu_percent:.1f}%, RAM {proc.memory_mb:.0f}MB\n"
+        gpu_condition += f"Top CPU: {_top_names(rankings['cpu'], lambda p: f'{p.cpu_percent:.1f}%')}\n"
+        gpu_condition += f"Top Disk I/O: {_top_names(rankings['io'], lambda p: f'{p.io_rate / 1024 ** 2:.1f} MB/s')}\n"
+        gpu_memory = {proc.pid: proc.used_memory_mb for proc in gpu.processes}
+        gpu_condition += (f"Top GPU Memory: "
+                          f"{_top_names(rankings['gpu_memory'], lambda p: f'{gpu_memory.get(p.pid, 0.0):.0f}MB')}\n")
         self.ask_button.setEnabled(False)
         self.response_text.setText("Waiting for response from GPU Expert AI...")
 
@@ -979,12 +995,20 @@ class SystemMonitor(QWidget):
     def boost_performance(self):
         try:
             killed = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info']):
+            processes = self.latest_snapshot.processes if self.latest_snapshot else ()
+            for proc in processes:
                 try:
-                    if proc.info['cpu_percent'] < 5 and proc.info['memory_info'].rss / 1024 / 1024 < 50:
-                        if proc.info['name'] not in ["explorer.exe", "python.exe", "SystemMonitor.exe"]:
-                            psutil.Process(proc.info['pid']).terminate()
-                            killed.append(proc.info['name'])
+                    # A process without a CPU interval yet has a placeholder 0%, not an idle one
+                    if not proc.measured:
+                        continue
+                    if proc.cpu_percent < 5 and proc.memory_mb < 50:
+                        if proc.name not in ["explorer.exe", "python.exe", "SystemMonitor.exe"]:
+                            target = psutil.Process(proc.pid)
+                            # Skip pids that were reused since the snapshot was taken
+                            if target.create_time() != proc.create_time:
+                                continue
+                            target.terminate()
+                            killed.append(proc.name)
                             if len(killed) >= 5:  # Limit to 5 processes
                                 break
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
@@ -1003,106 +1027,72 @@ class SystemMonitor(QWidget):
         except Exception as e:
             self.gaming_text.append(f"\n❌ Boost failed: {str(e)}")
 
-    def update_all(self):
-        """Update all data every second"""
+    def update_all(self, snapshot):
+        """Record a snapshot emitted by the collector thread and redraw the visible tab if it changed"""
         try:
-            # Always update metrics for graphs
-            self.update_metrics()
-            self.process_tracker.log_top_processes()
-            self.update_all_charts()
-
-            # Get current tab to optimize updates
-            current_tab = self.tabs.currentIndex()
-
-            # Update tabs based on which one is currently visible
-            if current_tab == 0:  # Processes tab
-                self.show_top_processes()
-            elif current_tab == 2:  # Gaming tab
-                self.show_gaming_stats()
-            elif current_tab == 3:  # ML tab
-                self.update_gpu_info()
-            elif current_tab == 4:  # Specs tab
-                # Update specs less frequently (every 5 seconds)
-                if not hasattr(self, '_spec_counter'):
-                    self._spec_counter = 0
-                self._spec_counter += 1
-                if self._spec_counter >= 5:
-                    self.show_specs()
-                    self._spec_counter = 0
+            self.latest_snapshot = snapshot
+            self.data_versions.update(snapshot.updated)
+            updated = snapshot.updated
+
+            # Graph history advances one point per CPU/RAM sample, drawn or not
+            if 'cpu' in updated:
+                self.record_metrics(snapshot)
+                self.rate_label.setText(f"⏱ {self.collector.rate.interval:.2f} s")
+
+            # Usage data only changes when a new process table is logged
+            if 'processes' in updated:
+                self.process_tracker.log_top_processes(snapshot.rankings['memory'], snapshot.process_interval,
+                                                       snapshot.exited)
+                # Exits are only reported once, even while the ML tab is hidden
+                self.pid_names.forget(snapshot.exited)
+
+            self.views.refresh()
 
         except Exception as e:
             print(f"Error in update_all: {e}")
 
-    def update_metrics(self):
+    def snapshot_version(self, *collectors):
+        """Version of the data a tab shows: how many snapshots its collectors have updated."""
+        if self.latest_snapshot is None:
+            return None
+        return tuple(self.data_versions[name] for name in collectors)
+
+    def record_metrics(self, snapshot):
         try:
             # Get current metrics
-            cpu_percent = psutil.cpu_percent()
-            ram_percent = psutil.virtual_memory().percent
+            cpu_percent = snapshot.cpu_percent
+            ram_percent = snapshot.memory.percent
 
-            gpus = GPUtil.getGPUs()
-            gpu_percent = gpus[0].load * 100 if gpus else 0
+            gpus = snapshot.gpus
+            gpu_percent = gpus[0].load_percent if gpus else 0
 
             # Update data lists
+            self.sample_times.append(snapshot.timestamp)
             self.cpu_usage.append(cpu_percent)
-            self.cpu_usage = self.cpu_usage[-30:]  # Keep last 30 data points
-
             self.ram_usage.append(ram_percent)
-            self.ram_usage = self.ram_usage[-30:]
-
             self.gpu_usage.append(gpu_percent)
-            self.gpu_usage = self.gpu_usage[-30:]
-
-            # Clear and update plots
-            self.canvas.cpu_ax.clear()
-            self.canvas.ram_ax.clear()
-            self.canvas.gpu_ax.clear()
-
-            # Time axis
-            time_points = list(range(len(self.cpu_usage)))
-
-            # CPU Plot
-            self.canvas.cpu_ax.plot(time_points, self.cpu_usage,
-                                    color="#ff6600", linewidth=2, marker='o', markersize=3)
-            self.canvas.cpu_ax.fill_between(time_points, self.cpu_usage, alpha=0.3, color="#ff6600")
-            self.canvas.cpu_ax.set_title("🧠 CPU Usage (%)", color="#ff6600", fontsize=12, fontweight='bold')
-            self.canvas.cpu_ax.set_ylim(0, 100)
-            self.canvas.cpu_ax.set_facecolor('#1a1a1a')
-
-            # RAM Plot
-            self.canvas.ram_ax.plot(time_points, self.ram_usage,
-                                    color="#00ff88", linewidth=2, marker='s', markersize=3)
-            self.canvas.ram_ax.fill_between(time_points, self.ram_usage, alpha=0.3, color="#00ff88")
-            self.canvas.ram_ax.set_title("💾 RAM Usage (%)", color="#00ff88", fontsize=12, fontweight='bold')
-            self.canvas.ram_ax.set_ylim(0, 100)
-            self.canvas.ram_ax.set_facecolor('#1a1a1a')
-
-            # GPU Plot
-            self.canvas.gpu_ax.plot(time_points, self.gpu_usage,
-                                    color="#ff0066", linewidth=2, marker='^', markersize=3)
-            self.canvas.gpu_ax.fill_between(time_points, self.gpu_usage, alpha=0.3, color="#ff0066")
-            self.canvas.gpu_ax.set_title("🎮 GPU Usage (%)", color="#ff0066", fontsize=12, fontweight='bold')
-            self.canvas.gpu_ax.set_ylim(0, 100)
-            self.canvas.gpu_ax.set_xlabel("Time (seconds)", color="#ff6600")
-            self.canvas.gpu_ax.set_facecolor('#1a1a1a')
-
-            # Style all axes
-            for ax in [self.canvas.cpu_ax, self.canvas.ram_ax, self.canvas.gpu_ax]:
-                ax.tick_params(colors='#ff6600', labelsize=8)
-                ax.spines['bottom'].set_color('#ff6600')
-                ax.spines['top'].set_color('#ff6600')
-                ax.spines['right'].set_color('#ff6600')
-                ax.spines['left'].set_color('#ff6600')
-                ax.grid(True, alpha=0.2, color='#ff6600')
-
-            self.canvas.fig.tight_layout()
-            self.canvas.draw()
+
+            # Keep the last HISTORY_SECONDS of samples, however fast they arrive
+            expired = bisect.bisect_left(self.sample_times, snapshot.timestamp - HISTORY_SECONDS)
+            if expired:
+                del self.sample_times[:expired]
+                del self.cpu_usage[:expired]
+                del self.ram_usage[:expired]
+                del self.gpu_usage[:expired]
 
         except Exception as e:
             print(f"Error updating metrics: {e}")
 
-    def get_system_info(self):
+    def draw_graphs(self):
+        if not self.sample_times:
+            return
+        # Time axis; samples are not evenly spaced once the rate adapts
+        time_points = [t - self.sample_times[0] for t in self.sample_times]
+        self.canvas.update_series(time_points, self.cpu_usage, self.ram_usage, self.gpu_usage)
+
+    def get_system_info(self, snapshot):
             try:
-                uname = platform.uname()
+                uname = snapshot.specs['uname']
                 info = f"""
     🖥️  SYSTEM OVERVIEW
     {'═' * 50}
@@ -1118,35 +1108,34 @@ class SystemMonitor(QWidget):
     🎮 GPU SPECIFICATIONS
     {'═' * 50}
     """
-                try:
-                    gpus = GPUtil.getGPUs()
-                    if gpus:
-                        for i, gpu in enumerate(gpus):
-                            info += f"""
+                gpus = snapshot.gpus
+                if gpus:
+                    for i, gpu in enumerate(gpus):
+                        info += f"""
     🔥 GPU {i + 1}: {gpu.name}
-    💾 Total Memory: {gpu.memoryTotal:.0f} MB
+    💾 Total Memory: {gpu.memory_total_mb:.0f} MB
     🌡️  Temperature: {gpu.temperature}°C
-    ⚡ Driver Version: {getattr(gpu, 'driver', 'N/A')}
-    🔌 GPU Load: {gpu.load * 100:.1f}%
-    💿 Memory Used: {gpu.memoryUsed:.0f} MB / {gpu.memoryTotal:.0f} MB
+    ⚡ Driver Version: {gpu.driver}
+    🔌 GPU Load: {gpu.load_percent:.1f}%
+    💿 Memory Used: {gpu.memory_used_mb:.0f} MB / {gpu.memory_total_mb:.0f} MB
     """
-                    else:
-                        info += "\n❌ No GPU detected or drivers not installed"
-                except Exception as e:
-                    info += f"\n❌ GPU Error: {str(e)}"
+                else:
+                    info += "\n❌ No GPU detected or drivers not installed"
 
                 # Add CPU info
+                freq = snapshot.cpu_freq
+                freq_text = f"{freq.current:.0f} MHz (Max: {freq.max:.0f} MHz)" if freq else "N/A"
                 info += f"""
 
     {'═' * 50}
     🧠 CPU SPECIFICATIONS  
     {'═' * 50}
-    🔢 CPU Cores: {psutil.cpu_count(logical=False)} Physical, {psutil.cpu_count(logical=True)} Logical
-    ⚡ CPU Frequency: {psutil.cpu_freq().current:.0f} MHz (Max: {psutil.cpu_freq().max:.0f} MHz)
+    🔢 CPU Cores: {snapshot.specs['physical_cores']} Physical, {snapshot.specs['logical_cores']} Logical
+    ⚡ CPU Frequency: {freq_text}
     """
 
                 # Add Memory info
-                memory = psutil.virtual_memory()
+                memory = snapshot.memory
                 info += f"""
 
     {'═' * 50}
@@ -1158,7 +1147,7 @@ class SystemMonitor(QWidget):
     """
 
                 # Add Disk info
-                disk = psutil.disk_usage('/')
+                disk = snapshot.disk
                 info += f"""
 
     {'═' * 50}
@@ -1169,6 +1158,19 @@ class SystemMonitor(QWidget):
     📊 Disk Usage: {(disk.used / disk.total) * 100:.1f}%
     """
 
+                # Add collector cost info
+                info += f"""
+
+    {'═' * 50}
+    ⏱️ COLLECTOR COST
+    {'═' * 50}
+    {'COLLECTOR':<12}{'PERIOD':<10}{'RUNS':<8}{'MISSED':<8}{'AVG (ms)':<10}{'LAST (ms)':<10}
+    """
+                for row in snapshot.collector_stats:
+                    period = f"{row['period']:.2f}s" if row['period'] is not None else "once"
+                    info += (f"{row['name']:<12}{period:<10}{row['runs']:<8}{row['missed']:<8}"
+                             f"{row['avg_ms']:<10.2f}{row['last_ms']:<10.2f}\n    ")
+
                 return info
             except Exception as e:
                 return f"❌ Error retrieving system information: {str(e)}"
@@ -1177,6 +1179,41 @@ class SystemMonitor(QWidget):
         button.setEnabled(True)
         button.setText("⚡ PERFORMANCE BOOST")
 
+    def on_tab_changed(self, index):
+        key = self.tab_keys.get(self.tabs.widget(index))
+        self.collector.rate.set_active_tab(key)
+        self.collector.wake()
+        self.views.set_active(key)
+
+    def update_window_state(self):
+        visible = self.isVisible() and not self.isMinimized()
+        was_visible = not self.collector.rate.hidden
+        self.collector.rate.set_window_state(visible, self.isActiveWindow())
+        self.views.set_window_visible(visible)
+        if visible and not was_visible:
+            self.collector.wake()
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.WindowStateChange, QEvent.ActivationChange):
+            self.update_window_state()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_window_state()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_window_state()
+
+    def closeEvent(self, event):
+        # Stop sampling before the tracker's connections go away
+        self.collector.stop()
+        self.usage_reader.stop()
+        get_gpu_provider().close()
+        self.process_tracker.close()
+        super().closeEvent(event)
+
 
 if __name__ == "__main__":
     try:
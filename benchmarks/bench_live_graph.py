@@ -0,0 +1,122 @@
+"""Frames/sec of the Graphs tab: the old clear-and-replot update against the
+blitting MplCanvas and the QPainter backend.
+
+Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_live_graph
+
+Each frame pushes one new sample into full CPU/RAM/GPU windows and renders
+it, then lets Qt process the resulting paint events. Windows are the old
+30 samples at 1 Hz and five minutes at 10 Hz.
+"""
+import random
+import statistics
+import time
+
+from PyQt5.QtWidgets import QApplication
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from helper.live_graph import MplCanvas, PainterGraph
+
+FRAMES = 100
+WARMUP = 5
+# (samples shown, seconds between samples)
+WINDOWS = ((30, 1.0), (3000, 0.1))
+SIZE = (1100, 700)
+
+
+def legacy_canvas():
+    fig = Figure(facecolor='#0a0a0a', edgecolor='#ff6600')
+    canvas = FigureCanvas(fig)
+    canvas.fig = fig
+    canvas.cpu_ax = fig.add_subplot(311)
+    canvas.ram_ax = fig.add_subplot(312)
+    canvas.gpu_ax = fig.add_subplot(313)
+    return canvas
+
+
+def legacy_update(canvas, time_points, cpu, ram, gpu):
+    # update_metrics before the blitting canvas, minus the bookkeeping
+    canvas.cpu_ax.clear()
+    canvas.ram_ax.clear()
+    canvas.gpu_ax.clear()
+
+    canvas.cpu_ax.plot(time_points, cpu, color="#ff6600", linewidth=2, marker='o', markersize=3)
+    canvas.cpu_ax.fill_between(time_points, cpu, alpha=0.3, color="#ff6600")
+    canvas.cpu_ax.set_title("🧠 CPU Usage (%)", color="#ff6600", fontsize=12, fontweight='bold')
+    canvas.cpu_ax.set_ylim(0, 100)
+    canvas.cpu_ax.set_facecolor('#1a1a1a')
+
+    canvas.ram_ax.plot(time_points, ram, color="#00ff88", linewidth=2, marker='s', markersize=3)
+    canvas.ram_ax.fill_between(time_points, ram, alpha=0.3, color="#00ff88")
+    canvas.ram_ax.set_title("💾 RAM Usage (%)", color="#00ff88", fontsize=12, fontweight='bold')
+    canvas.ram_ax.set_ylim(0, 100)
+    canvas.ram_ax.set_facecolor('#1a1a1a')
+
+    canvas.gpu_ax.plot(time_points, gpu, color="#ff0066", linewidth=2, marker='^', markersize=3)
+    canvas.gpu_ax.fill_between(time_points, gpu, alpha=0.3, color="#ff0066")
+    canvas.gpu_ax.set_title("🎮 GPU Usage (%)", color="#ff0066", fontsize=12, fontweight='bold')
+    canvas.gpu_ax.set_ylim(0, 100)
+    canvas.gpu_ax.set_xlabel("Time (seconds)", color="#ff6600")
+    canvas.gpu_ax.set_facecolor('#1a1a1a')
+
+    for ax in [canvas.cpu_ax, canvas.ram_ax, canvas.gpu_ax]:
+        ax.tick_params(colors='#ff6600', labelsize=8)
+        for side in ('bottom', 'top', 'right', 'left'):
+            ax.spines[side].set_color('#ff6600')
+        ax.grid(True, alpha=0.2, color='#ff6600')
+
+    canvas.fig.tight_layout()
+    canvas.draw()
+
+
+def blit_update(canvas, time_points, cpu, ram, gpu):
+    canvas.update_series(time_points, cpu, ram, gpu)
+
+
+def run(app, canvas, update, window, step):
+    canvas.resize(*SIZE)
+    canvas.show()
+    app.processEvents()
+
+    rng = random.Random(1)
+    times, cpu, ram, gpu = [], [], [], []
+    frame_ms = []
+    for frame in range(window + WARMUP + FRAMES):
+        times.append(frame * step)
+        cpu.append(rng.uniform(0, 100))
+        ram.append(rng.uniform(40, 60))
+        gpu.append(rng.uniform(0, 100))
+        del times[:-window], cpu[:-window], ram[:-window], gpu[:-window]
+        if frame < window:
+            continue
+
+        started = time.perf_counter()
+        update(canvas, [t - times[0] for t in times], cpu, ram, gpu)
+        app.processEvents()
+        # The first frames settle the axis span and cached backgrounds
+        if frame >= window + WARMUP:
+            frame_ms.append((time.perf_counter() - started) * 1000)
+    canvas.close()
+    return statistics.mean(frame_ms), statistics.median(frame_ms)
+
+
+def main():
+    app = QApplication([])
+    paths = {
+        'clear + replot': (legacy_canvas, legacy_update),
+        'matplotlib blit': (MplCanvas, blit_update),
+        'qpainter': (PainterGraph, blit_update),
+    }
+
+    print(f"{FRAMES} frames at {SIZE[0]}x{SIZE[1]}")
+    print(f"{'window':<16}{'path':<18}{'ms/frame':>10}{'median':>10}{'frames/s':>10}")
+    for window, step in WINDOWS:
+        label = f"{window} @ {1 / step:g} Hz"
+        for name, (widget, update) in paths.items():
+            mean, median = run(app, widget(), update, window, step)
+            print(f"{label:<16}{name:<18}{mean:>10.2f}{median:>10.2f}{1000 / mean:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""On-disk size and aggregation speed of the name-interned, epoch-second
+process_stats layout against the previous TEXT name / TEXT timestamp one.
+
+Run from the repository root:  python -m benchmarks.bench_name_encoding
+
+Both stores get the same synthetic month of top-5 samples (one tick every
+--step seconds, default 5) over a set of realistic process names, plus
+their covering index, and are VACUUMed before measuring.
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from helper.stats_db import connect, migrate
+
+DAYS = 30
+REPEATS = 5
+FIRST_DAY = '2025-01-01 00:00:00'
+NAMES = (
+    'chrome', 'firefox', 'code', 'python3.11', 'java', 'Xorg', 'gnome-shell', 'slack',
+    'Discord', 'steam', 'steamwebhelper', 'obs', 'docker-desktop', 'containerd', 'dockerd',
+    'postgres', 'mysqld', 'node', 'electron', 'spotify', 'thunderbird', 'pycharm64',
+    'idea64', 'clion', 'gradle-daemon', 'kotlin-daemon', 'rust-analyzer', 'clangd',
+    'cc1plus', 'ld.lld', 'systemd-journald', 'pipewire', 'pulseaudio', 'NetworkManager',
+    'tracker-miner-fs-3', 'evolution-data-server', 'gsd-xsettings', 'nautilus',
+    'libreoffice', 'zoom',
+)
+
+TEXT_SCHEMA = """
+CREATE TABLE process_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT,
+    process_name TEXT,
+    memory_usage_mb REAL,
+    time_in_top5 INTEGER,
+    sample_interval REAL DEFAULT 1.0
+);
+CREATE INDEX process_stats_by_time
+ON process_stats (timestamp, process_name, memory_usage_mb, sample_interval);
+"""
+
+TICKS = """
+WITH RECURSIVE ticks(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM ticks WHERE n + 1 < ?),
+     slots(slot) AS (SELECT 0 UNION ALL SELECT slot + 1 FROM slots WHERE slot < 4)
+"""
+
+QUERIES = {
+    'month by process': (
+        "SELECT process_name, SUM(sample_interval) FROM process_stats GROUP BY process_name",
+        """
+        SELECT n.name, t.total
+        FROM (SELECT name_id, SUM(sample_interval) AS total FROM process_stats GROUP BY name_id) AS t
+        JOIN process_names AS n ON n.id = t.name_id
+        """,
+    ),
+    'one day by process': (
+        """
+        SELECT process_name, SUM(sample_interval), AVG(memory_usage_mb) FROM process_stats
+        WHERE timestamp >= '2025-01-15 00:00:00' AND timestamp < '2025-01-16 00:00:00'
+        GROUP BY process_name
+        """,
+        """
+        SELECT n.name, t.total, t.memory
+        FROM (
+            SELECT name_id, SUM(sample_interval) AS total, AVG(memory_usage_mb) AS memory
+            FROM process_stats
+            WHERE timestamp >= CAST(strftime('%s', '2025-01-15') AS INTEGER)
+              AND timestamp < CAST(strftime('%s', '2025-01-16') AS INTEGER)
+            GROUP BY name_id
+        ) AS t JOIN process_names AS n ON n.id = t.name_id
+        """,
+    ),
+}
+
+
+def fill_text(conn, ticks, step):
+    conn.executescript(TEXT_SCHEMA)
+    conn.execute("CREATE TEMP TABLE names (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany("INSERT INTO names (id, name) VALUES (?, ?)", enumerate(NAMES))
+    with conn:
+        conn.execute(TICKS + """
+        INSERT INTO process_stats (timestamp, process_name, memory_usage_mb, time_in_top5, sample_interval)
+        SELECT datetime(?, '+' || (n * ?) || ' seconds'), names.name, 100.0 + slot * 37.5, n * ?, ?
+        FROM ticks, slots JOIN names ON names.id = (n / 600 + slot * 7) % ?
+        """, (ticks, FIRST_DAY, step, step, step, len(NAMES)))
+
+
+def fill_encoded(conn, ticks, step):
+    with contextlib.redirect_stdout(io.StringIO()):
+        migrate(conn)
+    with conn:
+        conn.executemany("INSERT INTO process_names (id, name) VALUES (?, ?)", enumerate(NAMES))
+        conn.execute(TICKS + """
+        INSERT INTO process_stats (timestamp, name_id, memory_usage_mb, time_in_top5, sample_interval)
+        SELECT CAST(strftime('%s', ?) AS INTEGER) + n * ?, (n / 600 + slot * 7) % ?, 100.0 + slot * 37.5,
+               n * ?, ?
+        FROM ticks, slots
+        """, (ticks, FIRST_DAY, step, len(NAMES), step, step))
+
+
+def measure(conn, query):
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        conn.execute(query).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--step', type=int, default=5, help='seconds between samples')
+    args = parser.parse_args()
+    ticks = DAYS * 86400 // args.step
+
+    directory = tempfile.mkdtemp(prefix='encoding-bench-')
+    try:
+        results = {}
+        for layout, fill in (('text', fill_text), ('encoded', fill_encoded)):
+            path = os.path.join(directory, f'{layout}.db')
+            conn = connect(path)
+            fill(conn, ticks, args.step)
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("VACUUM")
+            size = os.path.getsize(path)
+            timings = [measure(conn, queries[layout == 'encoded']) for queries in QUERIES.values()]
+            results[layout] = (size, timings)
+            conn.close()
+    finally:
+        shutil.rmtree(directory)
+
+    print(f"{DAYS} days, {ticks * 5} rows, {len(NAMES)} process names")
+    print(f"{'layout':<10}{'size (MB)':>12}" + ''.join(f"{name + ' (ms)':>26}" for name in QUERIES))
+    for layout, (size, timings) in results.items():
+        print(f"{layout:<10}{size / 2 ** 20:>12.1f}" + ''.join(f"{ms:>26.1f}" for ms in timings))
+    text_size, text_timings = results['text']
+    encoded_size, encoded_timings = results['encoded']
+    print(f"{'ratio':<10}{text_size / encoded_size:>11.2f}x"
+          + ''.join(f"{old / new:>25.2f}x" for old, new in zip(text_timings, encoded_timings)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Compare ProcScanner against the psutil.process_iter path used for the top-5 ranking.
+
+Run from the repository root:  python -m benchmarks.bench_proc_scanner
+Both paths read the same synthetic /proc tree (psutil via PROCFS_PATH).
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import psutil
+
+from helper.proc_scanner import ProcScanner
+
+SIZES = (1_000, 10_000, 50_000)
+ROUNDS = 3
+
+
+def make_fake_proc(root, count):
+    with open(os.path.join(root, 'stat'), 'w') as f:
+        f.write('cpu  1 2 3 4 5 6 7 0 0 0\nbtime 1700000000\n')
+    for pid in range(1, count + 1):
+        proc_dir = os.path.join(root, str(pid))
+        os.mkdir(proc_dir)
+        with open(os.path.join(proc_dir, 'stat'), 'w') as f:
+            f.write(f'{pid} (worker-{pid % 997}) S 1 {pid} {pid} 0 -1 4194560 100 0 0 0 '
+                    f'{pid * 3} {pid % 17} 0 0 20 0 1 0 {5000 + pid} 1000000 {pid % 4096} '
+                    '18446744073709551615 0 0 0 0 0 0 0 0 0 0 0 0 17 0 0 0 0 0 0\n')
+        with open(os.path.join(proc_dir, 'statm'), 'w') as f:
+            f.write(f'1000 {pid % 4096} 50 10 0 100 0\n')
+
+
+def current_top5():
+    processes = [(p.info['pid'], p.info['name'], p.info['memory_info'].rss / 1024 / 1024)
+                 for p in psutil.process_iter(['pid', 'name', 'memory_info'])]
+    return sorted(processes, key=lambda x: x[2], reverse=True)[:5]
+
+
+def scanner_top5(scanner):
+    scan = scanner.scan()
+    k = min(5, scan.count)
+    idx = np.argpartition(scan.rss, -k)[-k:] if k else []
+    return [(int(scan.pids[i]), scan.names[i], scan.rss[i] / 1024 / 1024) for i in idx]
+
+
+def best_of(func):
+    best = float('inf')
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    if not sys.platform.startswith('linux'):
+        print("The fake /proc benchmark needs psutil's Linux backend.")
+        return
+
+    print(f"{'pids':>8}{'process_iter (ms)':>20}{'ProcScanner (ms)':>20}{'speedup':>10}")
+    for size in SIZES:
+        root = tempfile.mkdtemp(prefix='fakeproc-')
+        try:
+            make_fake_proc(root, size)
+            psutil.PROCFS_PATH = root
+            scanner = ProcScanner(proc_root=root)
+            baseline = best_of(current_top5)
+            fast = best_of(lambda: scanner_top5(scanner))
+            print(f"{size:>8}{baseline * 1000:>20.1f}{fast * 1000:>20.1f}{baseline / fast:>9.1f}x")
+        finally:
+            psutil.PROCFS_PATH = '/proc'
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
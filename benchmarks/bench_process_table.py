@@ -0,0 +1,115 @@
+"""Processes-tab refresh cost with a very large process table.
+
+Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_process_table
+
+Builds --rows synthetic processes (default 20000) and replays ticks in
+which 5% of them change counters, 20 exit and 20 start. Each tick is
+rendered three ways, with Qt processing the resulting paint events:
+the old QTextEdit dump (extended to every row), a model reset with a
+sorting proxy, and ProcessTableModel's per-row diffs behind the same
+proxy.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableView, QTextEdit
+
+from helper.process_model import COLUMNS, ProcessSortProxy, ProcessTableModel
+from helper.process_snapshot import ProcessInfo
+
+TICKS = 20
+CHANGED = 0.05
+CHURN = 20
+SIZE = (1100, 700)
+
+
+def make_process(rng, pid):
+    return ProcessInfo(pid, f'proc-{pid % 997}', rng.uniform(1, 2000), rng.uniform(0, 100), 1000.0 + pid)
+
+
+def snapshots(rows, seed=1):
+    rng = random.Random(seed)
+    processes = {info.pid: info for info in (make_process(rng, pid) for pid in range(1, rows + 1))}
+    next_pid = rows + 1
+    yield tuple(processes.values())
+    while True:
+        for pid in rng.sample(list(processes), CHURN):
+            del processes[pid]
+        for _ in range(CHURN):
+            processes[next_pid] = make_process(rng, next_pid)
+            next_pid += 1
+        for pid in rng.sample(list(processes), int(len(processes) * CHANGED)):
+            processes[pid] = processes[pid]._replace(cpu_percent=rng.uniform(0, 100))
+        yield tuple(processes.values())
+
+
+def text_dump(widget, processes):
+    # show_top_processes before the model, minus the top-15 cut
+    text = f"{'PID':<10}{'PROCESS NAME':<25}{'RAM (MB)':<12}{'CPU (%)':<10}{'STATUS':<8}\n"
+    for info in processes:
+        text += f"{info.pid:<8}{info.name:<25}{info.memory_mb:<12.1f}{info.cpu_percent:<10.1f}\n"
+    widget.setText(text)
+
+
+class ResetModel(ProcessTableModel):
+    """Replaces every row on each tick, as a model without diffing would."""
+
+    def apply(self, processes):
+        self.load(processes)
+
+
+def table_view(model):
+    view = QTableView()
+    proxy = ProcessSortProxy(model, view)
+    view.setModel(proxy)
+    view.setSortingEnabled(True)
+    view.sortByColumn(COLUMNS.index('CPU (%)'), Qt.DescendingOrder)
+    return view
+
+
+def run(app, widget, update, rows):
+    widget.resize(*SIZE)
+    widget.show()
+    ticks = snapshots(rows)
+    update(next(ticks))
+    app.processEvents()
+
+    tick_ms = []
+    for _ in range(TICKS):
+        processes = next(ticks)
+        started = time.perf_counter()
+        update(processes)
+        app.processEvents()
+        tick_ms.append((time.perf_counter() - started) * 1000)
+    widget.close()
+    return statistics.mean(tick_ms), statistics.median(tick_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=20000)
+    args = parser.parse_args()
+    app = QApplication([])
+
+    text = QTextEdit()
+    reset_model = ResetModel()
+    diff_model = ProcessTableModel()
+    paths = {
+        'text dump': (text, lambda processes: text_dump(text, processes)),
+        'model reset': (table_view(reset_model), reset_model.apply),
+        'row diffs': (table_view(diff_model), diff_model.apply),
+    }
+
+    print(f"{args.rows} processes, {TICKS} ticks, {CHANGED:.0%} changed and {CHURN} exits/starts per tick")
+    print(f"{'path':<14}{'ms/tick':>10}{'median':>10}")
+    for name, (widget, update) in paths.items():
+        mean, median = run(app, widget, update, args.rows)
+        print(f"{name:<14}{mean:>10.1f}{median:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
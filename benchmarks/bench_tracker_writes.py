@@ -0,0 +1,96 @@
+"""Compare per-tick commits against ProcessStatsTracker's batched WAL writes.
+
+Run from the repository root:  python -m benchmarks.bench_tracker_writes
+
+Reports commits, not fsyncs: fsyncs happen inside SQLite and are not
+counted here. For reference, a rollback-journal commit with synchronous=FULL
+syncs the journal and the database file, while a WAL commit with
+synchronous=NORMAL does not sync and the WAL is only synced when it is
+checkpointed (every ~1000 pages by default).
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from helper.process_snapshot import ProcessInfo
+from helper.process_tracker import ProcessStatsTracker
+
+TICKS = 2000
+TOP5 = [ProcessInfo(pid, f'proc-{pid}', 100.0 + pid, 1.0, 1700000000.0 + pid) for pid in range(5)]
+
+
+def per_tick_commits(path):
+    # The write path before batching: five INSERTs and a commit every tick
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS process_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        process_name TEXT,
+        memory_usage_mb REAL,
+        time_in_top5 INTEGER
+    )
+    """)
+    conn.commit()
+
+    commits = 0
+    started = time.perf_counter()
+    for tick in range(TICKS):
+        for proc in TOP5:
+            cursor.execute("""
+            INSERT INTO process_stats (timestamp, process_name, memory_usage_mb, time_in_top5)
+            VALUES (?, ?, ?, ?)
+            """, ('2025-01-01 00:00:00', proc.name, proc.memory_mb, tick))
+        conn.commit()
+        commits += 1
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return elapsed, commits
+
+
+def batched(directory):
+    tracker = ProcessStatsTracker(os.path.join(directory, 'insightos.db'), legacy_dbs=None)
+    flushes = 0
+    original_flush = tracker.flush
+
+    def counting_flush(block=False):
+        nonlocal flushes
+        if tracker.pending_rows:
+            flushes += 1
+        original_flush(block)
+
+    tracker.flush = counting_flush
+    started = time.perf_counter()
+    for _ in range(TICKS):
+        tracker.log_top_processes(TOP5)
+    tracker.close()
+
+    # At one tick per second a flush happens on the timer or the row cap, whichever is first
+    ticks_per_flush = min(tracker.flush_interval, tracker.flush_rows / len(TOP5))
+    return time.perf_counter() - started, flushes, 3600 / ticks_per_flush
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix='tracker-bench-')
+    try:
+        old_time, old_commits = per_tick_commits(os.path.join(directory, 'legacy.db'))
+        new_time, new_commits, new_per_hour = batched(directory)
+    finally:
+        shutil.rmtree(directory)
+
+    rows = TICKS * len(TOP5)
+    # At one tick per second the legacy path commits 3600 times an hour
+    old_per_hour = 3600
+    print(f"{TICKS} ticks of {len(TOP5)} rows, run back to back")
+    print(f"{'path':<28}{'rows/sec':>12}{'commits':>10}{'commits/sec':>13}{'commits/h @1Hz':>17}")
+    print(f"{'per-tick commit (DELETE)':<28}{rows / old_time:>12.0f}{old_commits:>10}"
+          f"{old_commits / old_time:>13.0f}{old_per_hour:>17.0f}")
+    print(f"{'batched executemany (WAL)':<28}{rows / new_time:>12.0f}{new_commits:>10}"
+          f"{new_commits / new_time:>13.0f}{new_per_hour:>17.0f}")
+
+
+if __name__ == '__main__':
+    main()
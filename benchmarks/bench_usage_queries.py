@@ -0,0 +1,96 @@
+"""Usage-tab fetch latency against the amount of stored history.
+
+Run from the repository root:  python -m benchmarks.bench_usage_queries
+
+Fills a store with 1, 7 and 30 days of top-5 samples and times the old
+current-day query (SUM over every raw row) against the per-day totals
+table that fetch_current_day_stats reads now. Use --step to sample less
+often than once per second if building 30 days takes too long.
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from helper.stats_db import connect, migrate
+
+DAYS = (1, 7, 30)
+PROCESSES = 12
+REPEATS = 20
+FIRST_DAY = '2025-01-01'
+
+LEGACY_QUERY = """
+SELECT n.name, SUM(s.time_in_top5)
+FROM process_stats AS s JOIN process_names AS n ON n.id = s.name_id
+GROUP BY s.name_id
+"""
+TOTALS_QUERY = """
+SELECT n.name, t.time_in_top5_sec
+FROM process_day_totals AS t JOIN process_names AS n ON n.id = t.name_id
+WHERE t.date = ?
+"""
+
+
+def fill(conn, days, step):
+    # Five rows per tick, cycling through PROCESSES names
+    with conn:
+        conn.executemany("INSERT INTO process_names (id, name) VALUES (?, ?)",
+                         [(i + 1, f'proc-{i}') for i in range(PROCESSES)])
+        conn.execute("""
+        WITH RECURSIVE ticks(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM ticks WHERE n + 1 < ?)
+        INSERT INTO process_stats (timestamp, name_id, memory_usage_mb, time_in_top5, sample_interval)
+        SELECT CAST(strftime('%s', ?) AS INTEGER) + n * ?,
+               1 + (n + slot) % ?,
+               100.0 + slot,
+               n * ?,
+               ?
+        FROM ticks, (SELECT 0 AS slot UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4)
+        """, (days * 86400 // step, FIRST_DAY, step, PROCESSES, step, step))
+        conn.execute("""
+        INSERT INTO process_day_totals (date, name_id, time_in_top5_sec, memory_sum_mb, samples)
+        SELECT date(timestamp, 'unixepoch'), name_id, SUM(sample_interval), SUM(memory_usage_mb), COUNT(*)
+        FROM process_stats
+        GROUP BY 1, 2
+        """)
+    return conn.execute("SELECT COUNT(*) FROM process_stats").fetchone()[0]
+
+
+def timed(conn, query, params=()):
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        conn.execute(query, params).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--step', type=int, default=1, help='seconds between samples')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='usage-bench-')
+    try:
+        print(f"{'days':>5}{'raw rows':>12}{'SUM over raw (ms)':>20}{'day totals (ms)':>18}")
+        for days in DAYS:
+            path = os.path.join(directory, f'{days}d.db')
+            conn = connect(path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                migrate(conn)
+            rows = fill(conn, days, args.step)
+            last_day = conn.execute("SELECT MAX(date) FROM process_day_totals").fetchone()[0]
+
+            legacy = timed(conn, LEGACY_QUERY)
+            totals = timed(conn, TOTALS_QUERY, (last_day,))
+            print(f"{days:>5}{rows:>12}{legacy:>20.2f}{totals:>18.3f}")
+            conn.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
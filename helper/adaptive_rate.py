@@ -0,0 +1,87 @@
+import statistics
+import threading
+from collections import deque
+
+# Baseline interval (s) per tab; tabs without live charts can sample slower
+TAB_INTERVALS = {
+    'processes': 1.0,
+    'graphs': 1.0,
+    'gaming': 1.0,
+    'ml': 1.0,
+    'specs': 2.0,
+    'usage': 2.0,
+}
+
+
+class AdaptiveRateController:
+    """Chooses the collector's next sampling interval.
+
+    The GUI thread reports window visibility, focus and the active tab; the
+    collector thread feeds every snapshot through next_interval(). Flat
+    signals stretch the interval, a jump in CPU/GPU load drops it to
+    min_interval for a few ticks, and a hidden window pins it at
+    hidden_interval regardless of activity.
+    """
+
+    def __init__(self, base_interval=1.0, min_interval=0.25, max_interval=4.0, hidden_interval=5.0,
+                 window=10, spike_threshold=15.0, calm_threshold=2.0, burst_ticks=5):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.hidden_interval = hidden_interval
+        self.spike_threshold = spike_threshold
+        self.calm_threshold = calm_threshold
+        self.burst_ticks = burst_ticks
+
+        self._lock = threading.Lock()
+        self._history = deque(maxlen=window)
+        self._burst_left = 0
+        self._visible = True
+        self._focused = True
+        self._tab = None
+        self.interval = base_interval
+
+    def set_window_state(self, visible, focused):
+        with self._lock:
+            self._visible = visible
+            self._focused = focused
+
+    @property
+    def hidden(self):
+        return not self._visible
+
+    def set_active_tab(self, tab):
+        with self._lock:
+            self._tab = tab
+
+    def next_interval(self, snapshot):
+        load = max(snapshot.cpu_percent, snapshot.gpus[0].load_percent if snapshot.gpus else 0.0)
+
+        with self._lock:
+            if self._history and abs(load - self._history[-1]) >= self.spike_threshold:
+                self._burst_left = self.burst_ticks
+            self._history.append(load)
+            return self._choose(consume_burst=True)
+
+    def refresh_interval(self):
+        """Re-evaluate after a tab or window change without recording a sample."""
+        with self._lock:
+            return self._choose(consume_burst=False)
+
+    def _choose(self, consume_burst):
+        interval = TAB_INTERVALS.get(self._tab, self.base_interval)
+        if self._burst_left:
+            if consume_burst:
+                self._burst_left -= 1
+            interval = self.min_interval
+        elif len(self._history) == self._history.maxlen and \
+                statistics.pstdev(self._history) < self.calm_threshold:
+            interval = min(interval * 3, self.max_interval)
+
+        if not self._visible:
+            interval = self.hidden_interval
+        elif not self._focused:
+            interval = min(max(interval * 2, self.base_interval), self.max_interval)
+
+        self.interval = interval
+        return interval
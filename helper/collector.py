@@ -0,0 +1,187 @@
+import platform
+import threading
+import time
+from dataclasses import dataclass
+
+import psutil
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from helper.adaptive_rate import AdaptiveRateController
+from helper.gpu_provider import get_gpu_provider
+from helper.process_registry import ProcessRegistry
+from helper.scheduler import MultiRateScheduler
+from helper.topk import TopKEngine
+
+# Collector periods in seconds; None runs once at startup. CPU/RAM, processes
+# and GPU are scaled by the adaptive rate controller, the others are fixed.
+PERIODS = {
+    'specs': None,
+    'cpu': 1.0,
+    'processes': 2.0,
+    'gpu': 1.0,
+    'cpu_freq': 5.0,
+    'disk': 30.0,
+}
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Immutable view of the system, merged from the latest run of every collector."""
+    timestamp: float
+    cpu_percent: float
+    memory: tuple
+    gpus: tuple
+    processes: tuple
+    cpu_count: int
+    load_avg: tuple = None
+    spawned: tuple = ()
+    exited: tuple = ()
+    rankings: dict = None
+    interval: float = 1.0  # seconds since the previous snapshot
+    process_interval: float = 1.0  # seconds covered by the process table sample
+    specs: dict = None
+    cpu_freq: tuple = None
+    disk: tuple = None
+    updated: frozenset = frozenset()  # collectors that ran for this snapshot
+    collector_stats: tuple = ()
+
+
+def collect_specs():
+    return {
+        'uname': platform.uname(),
+        'physical_cores': psutil.cpu_count(logical=False),
+        'logical_cores': psutil.cpu_count(logical=True),
+    }
+
+
+def collect_cpu():
+    return {
+        'cpu_percent': psutil.cpu_percent(),
+        'memory': psutil.virtual_memory(),
+        'load_avg': psutil.getloadavg() if hasattr(psutil, 'getloadavg') else None,
+    }
+
+
+def collect_gpus():
+    return get_gpu_provider().samples()
+
+
+def collect_disk():
+    return psutil.disk_usage('/')
+
+
+class CollectorThread(QThread):
+    """Runs the multi-rate collectors off the GUI thread and emits a MetricsSnapshot
+    whenever any of them produced new data."""
+    snapshot_ready = pyqtSignal(object)
+
+    def __init__(self, interval=1.0, gpu_period=PERIODS['gpu'], parent=None):
+        super().__init__(parent)
+        self.rate = AdaptiveRateController(base_interval=interval)
+        self.registry = ProcessRegistry()
+        self.topk = TopKEngine()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+        self._state = {'gpus': (), 'processes': (), 'spawned': (), 'exited': (), 'rankings': self.topk.rank(())}
+        self._last_process_run = None
+        self._last_snapshot = None
+
+        self.scheduler = MultiRateScheduler()
+        self.scheduler.add('specs', collect_specs, PERIODS['specs'], scaled=False)
+        self.scheduler.add('gpu', collect_gpus, gpu_period, scaled=True)
+        self.scheduler.add('cpu', collect_cpu, PERIODS['cpu'], scaled=True)
+        self.scheduler.add('processes', self.collect_processes, PERIODS['processes'], scaled=True)
+        self.scheduler.add('cpu_freq', psutil.cpu_freq, PERIODS['cpu_freq'], scaled=False)
+        self.scheduler.add('disk', collect_disk, PERIODS['disk'], scaled=False)
+
+    def start(self, *args):
+        self._stop_event.clear()
+        super().start(*args)
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        self.wait()
+
+    def wake(self):
+        """Cut the current wait short, e.g. when the window becomes visible again."""
+        self._wake_event.set()
+
+    def collect_processes(self):
+        now = time.monotonic()
+        covered = now - self._last_process_run if self._last_process_run is not None else PERIODS['processes']
+        self._last_process_run = now
+
+        delta = self.registry.refresh()
+        processes = self.registry.snapshot()
+        # The GPU memory ranking uses the most recent GPU sample
+        gpu_memory = {proc.pid: proc.used_memory_mb for gpu in self._state['gpus'] for proc in gpu.processes}
+        return {
+            'processes': processes,
+            'spawned': delta.spawned,
+            'exited': delta.exited,
+            'rankings': self.topk.rank(processes, gpu_memory),
+            'process_interval': covered,
+        }
+
+    def merge(self, results):
+        state = self._state
+        if 'specs' in results:
+            state['specs'] = results['specs']
+        if 'gpu' in results:
+            state['gpus'] = results['gpu']
+        if 'cpu' in results:
+            state.update(results['cpu'])
+        if 'processes' in results:
+            # spawned/exited stay with the process table until the next
+            # collection replaces both; consumers act on them only when
+            # 'processes' is in updated
+            state.update(results['processes'])
+        if 'cpu_freq' in results:
+            state['cpu_freq'] = results['cpu_freq']
+        if 'disk' in results:
+            state['disk'] = results['disk']
+
+        now = time.monotonic()
+        interval = now - self._last_snapshot if self._last_snapshot is not None else self.rate.base_interval
+        self._last_snapshot = now
+
+        specs = state.get('specs') or {}
+        return MetricsSnapshot(
+            timestamp=time.time(),
+            cpu_percent=state.get('cpu_percent', 0.0),
+            memory=state.get('memory'),
+            gpus=state['gpus'],
+            processes=state['processes'],
+            cpu_count=specs.get('logical_cores'),
+            load_avg=state.get('load_avg'),
+            spawned=state['spawned'],
+            exited=state['exited'],
+            rankings=state['rankings'],
+            interval=interval,
+            process_interval=state.get('process_interval', PERIODS['processes']),
+            specs=specs,
+            cpu_freq=state.get('cpu_freq'),
+            disk=state.get('disk'),
+            updated=frozenset(results),
+            collector_stats=self.scheduler.stats(),
+        )
+
+    def run(self):
+        self.scheduler.reset()
+        while not self._stop_event.is_set():
+            results = self.scheduler.run_due()
+            if results:
+                snapshot = self.merge(results)
+                if 'cpu' in results:
+                    self.scheduler.set_scale(self.rate.next_interval(snapshot) / self.rate.base_interval)
+                self.snapshot_ready.emit(snapshot)
+
+            deadline = self.scheduler.next_deadline()
+            delay = deadline - time.monotonic() if deadline is not None else self.rate.interval
+            if self._wake_event.wait(max(0.0, delay)):
+                self._wake_event.clear()
+                # Woken by a tab or window change: apply the new rate right away
+                if not self._stop_event.is_set():
+                    self.scheduler.set_scale(self.rate.refresh_interval() / self.rate.base_interval)
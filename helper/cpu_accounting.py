@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+
+# pid occupies the low bits of an identity key, the start time the rest.
+# Linux caps pid_max at 2**22.
+PID_BITS = 22
+
+
+def identity_keys(pids, start_ticks):
+    return (np.asarray(start_ticks, dtype=np.int64) << PID_BITS) | np.asarray(pids, dtype=np.int64)
+
+
+class CpuAccountant:
+    """Interval CPU% and I/O rate for every process from cumulative counters.
+
+    Keeps the previous tick's counters per (pid, start time) identity, sorted
+    by key, and matches the new scan against them with one searchsorted, so
+    the whole table is computed in a handful of array operations. Processes
+    seen for the first time report 0 until they have an interval of history;
+    the returned mask tells which rows were actually measured.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._cpu = np.zeros(0, dtype=np.float64)
+        self._io = np.zeros(0, dtype=np.float64)
+        self._last = None
+
+    def update(self, pids, start_ticks, cpu_seconds, io_bytes):
+        now = self._clock()
+        elapsed = now - self._last if self._last is not None else 0.0
+        self._last = now
+
+        keys = identity_keys(pids, start_ticks)
+        cpu_seconds = np.asarray(cpu_seconds, dtype=np.float64)
+        io_bytes = np.asarray(io_bytes, dtype=np.float64)
+
+        cpu_percent = np.zeros(len(keys), dtype=np.float64)
+        io_rate = np.zeros(len(keys), dtype=np.float64)
+        measured = np.zeros(len(keys), dtype=bool)
+        if len(self._keys) and len(keys) and elapsed > 0:
+            idx = np.searchsorted(self._keys, keys)
+            idx[idx == len(self._keys)] = 0
+            matched = self._keys[idx] == keys
+            measured[:] = matched
+            cpu_percent[matched] = (cpu_seconds[matched] - self._cpu[idx[matched]]) / elapsed * 100
+            io_rate[matched] = (io_bytes[matched] - self._io[idx[matched]]) / elapsed
+            np.maximum(cpu_percent, 0.0, out=cpu_percent)
+            np.maximum(io_rate, 0.0, out=io_rate)
+
+        # Exited identities drop out simply by not being carried forward
+        order = np.argsort(keys)
+        self._keys = keys[order]
+        self._cpu = cpu_seconds[order]
+        self._io = io_bytes[order]
+        return cpu_percent, io_rate, measured
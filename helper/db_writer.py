@@ -0,0 +1,87 @@
+import queue
+import sqlite3
+import threading
+
+from helper.stats_db import connect
+
+
+class DatabaseWriter(threading.Thread):
+    """Single thread that owns the write connection and applies queued jobs.
+
+    A job is a callable taking the connection; it runs its statements in one
+    transaction and commits it itself. The queue is bounded and submit()
+    never blocks by default, so a slow disk shows up as queue depth and
+    rejected jobs instead of a frozen UI.
+    """
+
+    # Longest a blocking submit() or stop() waits on a stuck writer, in seconds
+    TIMEOUT = 10.0
+
+    def __init__(self, path, maxsize=64):
+        super().__init__(name='DatabaseWriter', daemon=True)
+        self.path = path
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.max_depth = 0
+        self.jobs_done = 0
+        self.rows_written = 0
+        self.rejected = 0
+        self.errors = 0
+
+    def submit(self, job, rows=0, block=False):
+        """Queue job; returns False if the queue stays full or the writer is gone."""
+        # A dead writer never drains the queue, so blocking on it would hang
+        if block and not self.is_alive():
+            self.rejected += 1
+            return False
+        try:
+            self.queue.put((job, rows), block=block, timeout=self.TIMEOUT if block else None)
+        except queue.Full:
+            self.rejected += 1
+            return False
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return True
+
+    def stop(self):
+        # Everything queued before the sentinel is still written
+        if not self.is_alive():
+            return
+        try:
+            self.queue.put(None, timeout=self.TIMEOUT)
+        except queue.Full:
+            print("Database writer did not drain its queue; stopping without it")
+            return
+        self.join(self.TIMEOUT)
+
+    def run(self):
+        conn = connect(self.path)
+        try:
+            # Any failing job is logged and rolled back; the thread must keep
+            # draining the queue or blocking submits and stop() would hang
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                job, rows = item
+                try:
+                    job(conn)
+                    self.rows_written += rows
+                except Exception as e:
+                    self.errors += 1
+                    print(f"Database write failed: {e!r}")
+                    try:
+                        conn.rollback()
+                    except sqlite3.Error:
+                        pass
+                self.jobs_done += 1
+        finally:
+            conn.close()
+
+    def stats(self):
+        return {
+            'queue_depth': self.queue.qsize(),
+            'max_depth': self.max_depth,
+            'jobs_done': self.jobs_done,
+            'rows_written': self.rows_written,
+            'rejected_jobs': self.rejected,
+            'errors': self.errors,
+        }
@@ -0,0 +1,225 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from dataclasses import dataclass
+
+try:
+    import pynvml
+except ImportError:
+    pynvml = None
+
+GpuProcess = namedtuple('GpuProcess', ['pid', 'used_memory_mb'])
+
+# How long one device read is reused by every reader (collector, ML tab, stats screens)
+DEFAULT_GPU_TTL = 0.25
+
+
+@dataclass(frozen=True)
+class GpuSample:
+    """One device's telemetry at a point in time."""
+    index: int
+    name: str
+    driver: str
+    temperature: float
+    load_percent: float
+    memory_used_mb: float
+    memory_total_mb: float
+    power_w: float = 0.0
+    fan_speed: int = 0
+    encoder_util: int = 0
+    decoder_util: int = 0
+    core_clock_mhz: int = 0
+    memory_clock_mhz: int = 0
+    throttle_reasons: int = 0
+    processes: tuple = ()
+
+
+class GpuProvider(ABC):
+    """Source of GpuSample tuples; subclasses keep whatever session they need alive."""
+
+    @abstractmethod
+    def samples(self):
+        """Return a tuple of GpuSample, one per readable device."""
+
+    def close(self):
+        pass
+
+
+class NvmlGpuProvider(GpuProvider):
+    """Holds one NVML session and its device handles for the life of the process."""
+
+    def __init__(self):
+        self.available = False
+        self._handles = []
+        self._static = []
+        self._driver = 'N/A'
+        if pynvml is None:
+            return
+
+        try:
+            pynvml.nvmlInit()
+        except pynvml.NVMLError as err:
+            print(f"Failed to initialize NVML: {err}")
+            return
+
+        self.available = True
+        try:
+            self._driver = _to_str(pynvml.nvmlSystemGetDriverVersion())
+        except pynvml.NVMLError:
+            pass
+
+        # Handles, names and total memory never change, so read them once
+        try:
+            for i in range(pynvml.nvmlDeviceGetCount()):
+                handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+                name = _to_str(pynvml.nvmlDeviceGetName(handle))
+                total_mb = pynvml.nvmlDeviceGetMemoryInfo(handle).total / 1024 / 1024
+                self._handles.append(handle)
+                self._static.append((name, total_mb))
+        except pynvml.NVMLError as err:
+            print(f"Failed to enumerate GPUs: {err}")
+            self.close()
+
+    def samples(self):
+        if not self.available:
+            return ()
+        samples = []
+        for i, handle in enumerate(self._handles):
+            # A transient driver error drops that device from this read only;
+            # callers include QTimer slots that must never see NVMLError
+            try:
+                samples.append(self._sample(i, handle))
+            except pynvml.NVMLError as err:
+                print(f"Failed to read GPU {i}: {err}")
+        return tuple(samples)
+
+    def _sample(self, index, handle):
+        name, total_mb = self._static[index]
+        util = pynvml.nvmlDeviceGetUtilizationRates(handle)
+        memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+
+        return GpuSample(
+            index=index,
+            name=name,
+            driver=self._driver,
+            temperature=_query(pynvml.nvmlDeviceGetTemperature, handle, pynvml.NVML_TEMPERATURE_GPU),
+            load_percent=float(util.gpu),
+            memory_used_mb=memory.used / 1024 / 1024,
+            memory_total_mb=total_mb,
+            power_w=_query(pynvml.nvmlDeviceGetPowerUsage, handle) / 1000,
+            fan_speed=_query(pynvml.nvmlDeviceGetFanSpeed, handle),
+            encoder_util=_query(pynvml.nvmlDeviceGetEncoderUtilization, handle, default=(0, 0))[0],
+            decoder_util=_query(pynvml.nvmlDeviceGetDecoderUtilization, handle, default=(0, 0))[0],
+            core_clock_mhz=_query(pynvml.nvmlDeviceGetClockInfo, handle, pynvml.NVML_CLOCK_GRAPHICS),
+            memory_clock_mhz=_query(pynvml.nvmlDeviceGetClockInfo, handle, pynvml.NVML_CLOCK_MEM),
+            throttle_reasons=_query(pynvml.nvmlDeviceGetCurrentClocksThrottleReasons, handle),
+            processes=self._processes(handle),
+        )
+
+    def _processes(self, handle):
+        procs = {}
+        for query in (pynvml.nvmlDeviceGetComputeRunningProcesses, pynvml.nvmlDeviceGetGraphicsRunningProcesses):
+            for proc in _query(query, handle, default=()):
+                used = (proc.usedGpuMemory or 0) / 1024 / 1024
+                if proc.pid not in procs or used > procs[proc.pid].used_memory_mb:
+                    procs[proc.pid] = GpuProcess(proc.pid, used)
+        return tuple(procs.values())
+
+    def close(self):
+        if self.available:
+            self.available = False
+            self._handles = []
+            pynvml.nvmlShutdown()
+
+
+class FakeGpuProvider(GpuProvider):
+    """In-memory provider for GPU-less machines and tests; returns whatever it was given."""
+
+    def __init__(self, samples=()):
+        self._samples = tuple(samples)
+        self.calls = 0
+
+    def set_samples(self, samples):
+        self._samples = tuple(samples)
+
+    def samples(self):
+        self.calls += 1
+        return self._samples
+
+
+class CachedGpuProvider(GpuProvider):
+    """Thread-safe TTL cache in front of another provider.
+
+    Refreshes are single-flight: the lock is held while the wrapped provider is
+    queried, so callers that arrive mid-refresh wait and then reuse its result
+    instead of issuing a duplicate device query.
+    """
+
+    def __init__(self, provider, ttl=DEFAULT_GPU_TTL, clock=time.monotonic):
+        self.provider = provider
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._samples = ()
+        self._fetched_at = None
+        self.hits = 0
+        self.misses = 0
+
+    def samples(self):
+        with self._lock:
+            now = self._clock()
+            if self._fetched_at is not None and now - self._fetched_at < self.ttl:
+                self.hits += 1
+                return self._samples
+
+            self.misses += 1
+            try:
+                self._samples = self.provider.samples()
+            finally:
+                # A failed read is cached too so a broken driver is not hammered
+                self._fetched_at = self._clock()
+            return self._samples
+
+    def invalidate(self):
+        with self._lock:
+            self._fetched_at = None
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        self.provider.close()
+
+
+def _to_str(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _query(func, *args, default=0):
+    # Optional counters are not supported on every board; treat them as zero
+    try:
+        return func(*args)
+    except pynvml.NVMLError:
+        return default
+
+
+_default_provider = None
+_default_lock = threading.Lock()
+
+
+def get_gpu_provider():
+    """Process-wide provider shared by the collector and the standalone screens."""
+    global _default_provider
+    with _default_lock:
+        if _default_provider is None:
+            _default_provider = CachedGpuProvider(NvmlGpuProvider())
+        return _default_provider
+
+
+def set_gpu_provider(provider):
+    """Swap the shared provider, e.g. for a FakeGpuProvider on CI."""
+    global _default_provider
+    with _default_lock:
+        _default_provider = provider
@@ -0,0 +1,63 @@
+class View:
+    __slots__ = ('version', 'render', 'drawn')
+
+    def __init__(self, version, render):
+        self.version = version
+        self.render = render
+        self.drawn = None
+
+
+class ViewInvalidator:
+    """Decides which tab views need rendering.
+
+    Every view is registered with a version callable and a render callable.
+    The version is any comparable value that changes whenever the view's
+    data does, and None while there is nothing to show yet. refresh() renders
+    only the active view, only while the window is visible, and only when
+    its version differs from the one it last drew. Switching tabs or
+    un-minimizing the window refreshes once, so the view catches up on
+    whatever changed while it was hidden.
+    """
+
+    def __init__(self):
+        self.views = {}
+        self.active = None
+        self.window_visible = False
+        self.renders = 0
+        self.skipped = 0
+
+    def add(self, key, version, render):
+        self.views[key] = View(version, render)
+
+    def invalidate(self, key):
+        """Force the view to redraw the next time it is refreshed while visible."""
+        self.views[key].drawn = None
+
+    def set_active(self, key):
+        self.active = key
+        self.refresh()
+
+    def set_window_visible(self, visible):
+        changed = visible != self.window_visible
+        self.window_visible = visible
+        if visible and changed:
+            self.refresh()
+
+    def refresh(self):
+        view = self.views.get(self.active)
+        if view is None or not self.window_visible:
+            return False
+
+        version = view.version()
+        if version is None or version == view.drawn:
+            self.skipped += 1
+            return False
+
+        view.render()
+        # Only after a successful render, so a failed one is retried
+        view.drawn = version
+        self.renders += 1
+        return True
+
+    def stats(self):
+        return {'renders': self.renders, 'skipped': self.skipped}
@@ -0,0 +1,336 @@
+import os
+
+from PyQt5.QtCore import Qt, QPointF, QRectF, QLineF
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen, QPixmap, QPolygonF
+from PyQt5.QtWidgets import QWidget
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from matplotlib.patches import Polygon
+
+# (key, title, color, marker) of each stacked graph, top to bottom
+SERIES = (
+    ('cpu', "🧠 CPU Usage (%)", "#ff6600", 'o'),
+    ('ram', "💾 RAM Usage (%)", "#00ff88", 's'),
+    ('gpu', "🎮 GPU Usage (%)", "#ff0066", '^'),
+)
+# Time axis lengths (s) the x range snaps to, so it rarely changes
+SPANS = (10, 30, 60, 120, 300, 600)
+# Seconds of samples kept on screen, whatever the sampling rate
+HISTORY_SECONDS = 300
+
+# Picked with INSIGHTOS_GRAPH_BACKEND=<name>; unknown names fall back to matplotlib
+DEFAULT_BACKEND = 'qpainter'
+FALLBACK_BACKEND = 'matplotlib'
+
+
+def span_for(last_time):
+    return next((s for s in SPANS if s >= last_time), SPANS[-1])
+
+
+class LiveGraph:
+    """Widget showing one series per SERIES entry against a shared time axis.
+
+    update_series() is called once per CPU/RAM sample with the sample times
+    in seconds since the oldest one shown and one list of percentages per
+    series; the widget decides how and when to repaint.
+    """
+
+    def update_series(self, time_points, *series):
+        raise NotImplementedError
+
+
+class PainterGraph(QWidget, LiveGraph):
+    """Live graphs painted directly with QPainter.
+
+    Frames, grids, titles and tick labels are rendered into a cached pixmap
+    that is rebuilt only on resize or when the time axis changes span. A
+    repaint copies it and draws each series as plain line segments over an
+    unantialiased fill; Qt strokes a wide antialiased polyline as one path,
+    which costs hundreds of milliseconds at a few thousand points. Series
+    denser than one sample per BUCKET_WIDTH pixels are first reduced to each
+    bucket's min and max, so minutes of history cost about as much as a
+    screenful.
+    """
+    PADDING = 8
+    TITLE_HEIGHT = 24
+    TICK_HEIGHT = 16
+    XLABEL_HEIGHT = 18
+    YLABEL_WIDTH = 34
+    RIGHT_MARGIN = 12
+    # Samples closer together than this (px) are drawn without markers
+    MARKER_SPACING = 6
+    BUCKET_WIDTH = 2
+    Y_TICKS = (0, 20, 40, 60, 80, 100)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.span = SPANS[0]
+        self.time_points = []
+        self.series = ()
+        self.plots = []
+        self.background = None
+
+        self.accent = QColor('#ff6600')
+        self.grid_pen = QPen(QColor(255, 102, 0, 51), 1)
+        self.tick_font = QFont()
+        self.tick_font.setPointSize(8)
+        self.title_font = QFont()
+        self.title_font.setPointSize(12)
+        self.title_font.setBold(True)
+        self.colors = [QColor(color) for _, _, color, _ in SERIES]
+        self.fill_colors = [QColor(color) for _, _, color, _ in SERIES]
+        for color in self.fill_colors:
+            color.setAlphaF(0.3)
+
+    def update_series(self, time_points, *series):
+        span = span_for(time_points[-1])
+        if span != self.span:
+            self.span = span
+            self.background = None
+        self.time_points = time_points
+        self.series = series
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.background = None
+
+    def paintEvent(self, event):
+        if self.background is None:
+            self.build_background()
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.background)
+        if not self.time_points:
+            return
+
+        for plot, values, (_, _, _, marker), color, fill_color in zip(
+                self.plots, self.series, SERIES, self.colors, self.fill_colors):
+            painter.setClipRect(plot)
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(fill_color)
+            dense = len(values) * self.BUCKET_WIDTH > plot.width()
+            if dense:
+                points, fill = self.project_buckets(plot, values)
+                painter.drawRects(fill)
+                sparse = False
+            else:
+                points = self.project(plot, values)
+                bottom = plot.bottom()
+                for a, b in zip(points, points[1:]):
+                    painter.drawPolygon(QPolygonF([QPointF(a.x(), bottom), a, b, QPointF(b.x(), bottom)]))
+                spacing = (points[-1].x() - points[0].x()) / (len(points) - 1) if len(points) > 1 else 0
+                sparse = spacing >= self.MARKER_SPACING
+
+            # Bucketed lines are mostly 1-2 px steps that antialiasing would
+            # only blur, at five times the cost
+            painter.setRenderHint(QPainter.Antialiasing, not dense)
+            painter.setPen(QPen(color, 2))
+            painter.drawLines([QLineF(a, b) for a, b in zip(points, points[1:])])
+
+            if sparse:
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(color)
+                for point in points:
+                    self.draw_marker(painter, point, marker)
+
+    def project(self, plot, values):
+        """Map every sample to widget coordinates inside plot."""
+        x_scale = plot.width() / self.span
+        y_scale = plot.height() / 100
+        left, bottom = plot.left(), plot.bottom()
+        return [QPointF(left + t * x_scale, bottom - v * y_scale) for t, v in zip(self.time_points, values)]
+
+    def project_buckets(self, plot, values):
+        """Reduce samples to the low and high point of every BUCKET_WIDTH
+        pixel column, keeping spikes visible; returns the line points and
+        one fill rect per bucket."""
+        width = self.BUCKET_WIDTH
+        bucket_scale = plot.width() / self.span / width
+        buckets = []
+        bucket = int(self.time_points[0] * bucket_scale)
+        low = high = values[0]
+        for t, v in zip(self.time_points, values):
+            b = int(t * bucket_scale)
+            if b != bucket:
+                buckets.append((bucket, low, high))
+                bucket, low, high = b, v, v
+            elif v < low:
+                low = v
+            elif v > high:
+                high = v
+        buckets.append((bucket, low, high))
+
+        y_scale = plot.height() / 100
+        left, bottom = plot.left(), plot.bottom()
+        points = [QPointF(left + b * width, bottom - y * y_scale) for b, low, high in buckets for y in (low, high)]
+        fill = [QRectF(left + b * width, bottom - high * y_scale, width, high * y_scale) for b, _, high in buckets]
+        return points, fill
+
+    def draw_marker(self, painter, point, marker):
+        if marker == 's':
+            painter.drawRect(QRectF(point.x() - 2.5, point.y() - 2.5, 5, 5))
+        elif marker == '^':
+            painter.drawPolygon(QPolygonF([QPointF(point.x(), point.y() - 3), QPointF(point.x() - 3, point.y() + 2.5),
+                                           QPointF(point.x() + 3, point.y() + 2.5)]))
+        else:
+            painter.drawEllipse(point, 2.5, 2.5)
+
+    def build_background(self):
+        ratio = self.devicePixelRatioF()
+        self.background = QPixmap(self.size() * ratio)
+        self.background.setDevicePixelRatio(ratio)
+        self.background.fill(QColor('#0a0a0a'))
+
+        painter = QPainter(self.background)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.accent, 2))
+        painter.drawRoundedRect(QRectF(self.rect()).adjusted(1, 1, -1, -1), 8, 8)
+
+        pad = self.PADDING
+        panel_height = (self.height() - 2 * pad - self.XLABEL_HEIGHT) / len(SERIES)
+        width = self.width() - 2 * pad - self.YLABEL_WIDTH - self.RIGHT_MARGIN
+        self.plots = []
+        for i, ((_, title, _, _), color) in enumerate(zip(SERIES, self.colors)):
+            top = pad + i * panel_height
+            plot = QRectF(pad + self.YLABEL_WIDTH, top + self.TITLE_HEIGHT, width,
+                          panel_height - self.TITLE_HEIGHT - self.TICK_HEIGHT)
+            self.plots.append(plot)
+            painter.fillRect(plot, QColor('#1a1a1a'))
+
+            painter.setFont(self.tick_font)
+            for value in self.Y_TICKS:
+                y = plot.bottom() - value * plot.height() / 100
+                painter.setPen(self.grid_pen)
+                painter.drawLine(QLineF(plot.left(), y, plot.right(), y))
+                painter.setPen(self.accent)
+                painter.drawText(QRectF(pad, y - 8, self.YLABEL_WIDTH - 4, 16),
+                                 Qt.AlignRight | Qt.AlignVCenter, str(value))
+            for k in range(6):
+                seconds = self.span * k / 5
+                x = plot.left() + k * plot.width() / 5
+                painter.setPen(self.grid_pen)
+                painter.drawLine(QLineF(x, plot.top(), x, plot.bottom()))
+                painter.setPen(self.accent)
+                painter.drawText(QRectF(x - 30, plot.bottom() + 1, 60, self.TICK_HEIGHT - 1),
+                                 Qt.AlignHCenter | Qt.AlignTop, f"{seconds:g}")
+
+            painter.setPen(QPen(self.accent, 1))
+            painter.drawRect(plot)
+            painter.setFont(self.title_font)
+            painter.setPen(color)
+            painter.drawText(QRectF(plot.left(), top, plot.width(), self.TITLE_HEIGHT), Qt.AlignCenter, title)
+
+        painter.setFont(self.tick_font)
+        painter.setPen(self.accent)
+        painter.drawText(QRectF(pad + self.YLABEL_WIDTH, self.height() - pad - self.XLABEL_HEIGHT, width,
+                                self.XLABEL_HEIGHT), Qt.AlignCenter, "Time (seconds)")
+        painter.end()
+
+
+# Enhanced Matplotlib Canvas
+class MplCanvas(FigureCanvas, LiveGraph):
+    """Live CPU/RAM/GPU graphs drawn by blitting.
+
+    Titles, ticks, grids and spines are rendered once into a cached
+    background; each update only moves the line and fill artists with
+    set_data/set_xy and blits the three axes. The full figure is redrawn,
+    and the layout recomputed, only on resize or when the time axis has to
+    grow to fit the samples.
+    """
+
+    def __init__(self, parent=None):
+        self.fig = Figure(facecolor='#0a0a0a', edgecolor='#ff6600')
+        self.fig.patch.set_facecolor('#0a0a0a')
+
+        # Create subplots with custom spacing
+        self.cpu_ax = self.fig.add_subplot(311)
+        self.ram_ax = self.fig.add_subplot(312)
+        self.gpu_ax = self.fig.add_subplot(313)
+        self.axes = (self.cpu_ax, self.ram_ax, self.gpu_ax)
+
+        self.lines = []
+        self.fills = []
+        self.span = SPANS[0]
+        for ax, (_, title, color, marker) in zip(self.axes, SERIES):
+            # Style the axes
+            ax.set_facecolor('#1a1a1a')
+            ax.tick_params(colors='#ff6600', labelsize=8)
+            ax.spines['bottom'].set_color('#ff6600')
+            ax.spines['top'].set_color('#ff6600')
+            ax.spines['right'].set_color('#ff6600')
+            ax.spines['left'].set_color('#ff6600')
+            ax.grid(True, alpha=0.2, color='#ff6600')
+            ax.set_title(title, color=color, fontsize=12, fontweight='bold')
+            ax.set_ylim(0, 100)
+            ax.set_xlim(0, self.span)
+
+            # Animated artists are left out of full draws and drawn by blit()
+            line, = ax.plot([], [], color=color, linewidth=2, marker=marker, markersize=3, animated=True)
+            fill = Polygon([(0, 0)], closed=True, alpha=0.3, color=color, linewidth=0, animated=True)
+            ax.add_patch(fill)
+            self.lines.append(line)
+            self.fills.append(fill)
+        self.gpu_ax.set_xlabel("Time (seconds)", color="#ff6600")
+
+        super().__init__(self.fig)
+        self.setStyleSheet("""
+            QWidget {
+                background-color: #0a0a0a;
+                border: 2px solid #ff6600;
+                border-radius: 8px;
+            }
+        """)
+        self.background = None
+        self.mpl_connect('draw_event', self.on_draw)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # The only time the layout can change; the full redraw it triggers
+        # refreshes the cached background
+        self.fig.tight_layout()
+
+    def on_draw(self, event):
+        self.background = self.copy_from_bbox(self.fig.bbox)
+        self.draw_series()
+
+    def draw_series(self):
+        for ax, line, fill in zip(self.axes, self.lines, self.fills):
+            ax.draw_artist(fill)
+            ax.draw_artist(line)
+
+    def update_series(self, time_points, *series):
+        span = span_for(time_points[-1])
+        for line, fill, values in zip(self.lines, self.fills, series):
+            line.set_data(time_points, values)
+            fill.set_xy([(time_points[0], 0), *zip(time_points, values), (time_points[-1], 0)])
+
+        if span != self.span or self.background is None:
+            # Tick labels change with the x range, so the background is stale
+            self.span = span
+            for ax in self.axes:
+                ax.set_xlim(0, span)
+            self.draw_idle()
+            return
+
+        self.restore_region(self.background)
+        self.draw_series()
+        for ax in self.axes:
+            self.blit(ax.bbox)
+
+
+BACKENDS = {
+    'qpainter': PainterGraph,
+    'matplotlib': MplCanvas,
+}
+
+
+def create_live_graph(backend=None, parent=None):
+    """Build the Graphs-tab widget for backend, INSIGHTOS_GRAPH_BACKEND or the default."""
+    backend = backend or os.environ.get('INSIGHTOS_GRAPH_BACKEND', DEFAULT_BACKEND)
+    if backend not in BACKENDS:
+        print(f"Unknown graph backend {backend!r}, using {FALLBACK_BACKEND}")
+        backend = FALLBACK_BACKEND
+    return BACKENDS[backend](parent)
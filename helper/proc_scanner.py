@@ -0,0 +1,129 @@
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+import psutil
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+# Arrays are views into the scanner's buffers and are overwritten by the next
+# scan; copy them if they have to outlive the tick. utime/stime are seconds,
+# start_ticks identifies a process together with its pid. io is cumulative
+# read+write bytes and stays zero unless the scanner was built with read_io.
+ProcScan = namedtuple('ProcScan', ['count', 'pids', 'names', 'start_ticks', 'utime', 'stime', 'rss', 'io'])
+
+
+class ProcScanner:
+    """Bulk reader of per-process CPU time and RSS into preallocated arrays.
+
+    On Linux it reads /proc/[pid]/stat and /proc/[pid]/statm directly, which
+    skips building a psutil.Process per pid. Elsewhere it falls back to psutil
+    and fills the same arrays. proc_root can point at a fake tree for benchmarks.
+    """
+
+    def __init__(self, proc_root='/proc', capacity=1024, fast_path=None, read_io=False):
+        self.proc_root = proc_root
+        self.read_io = read_io
+        if fast_path is None:
+            fast_path = sys.platform.startswith('linux') and os.path.isdir(proc_root)
+        self.fast_path = fast_path
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.pids = np.zeros(capacity, dtype=np.int64)
+        self.start_ticks = np.zeros(capacity, dtype=np.int64)
+        self.utime = np.zeros(capacity, dtype=np.float64)
+        self.stime = np.zeros(capacity, dtype=np.float64)
+        self.rss = np.zeros(capacity, dtype=np.int64)
+        self.io = np.zeros(capacity, dtype=np.int64)
+        self.names = [None] * capacity
+
+    def _grow(self):
+        old = (self.pids, self.start_ticks, self.utime, self.stime, self.rss, self.io, self.names)
+        self._allocate(self.capacity * 2)
+        for new, prev in zip((self.pids, self.start_ticks, self.utime, self.stime, self.rss, self.io), old):
+            new[:len(prev)] = prev
+        self.names[:len(old[6])] = old[6]
+
+    def scan(self):
+        count = self._scan_proc() if self.fast_path else self._scan_psutil()
+        return ProcScan(count, self.pids[:count], self.names[:count], self.start_ticks[:count],
+                        self.utime[:count], self.stime[:count], self.rss[:count], self.io[:count])
+
+    def _scan_proc(self):
+        root = self.proc_root
+        count = 0
+        for pid in os.listdir(root):
+            if not pid.isdigit():
+                continue
+            try:
+                stat = _read(f'{root}/{pid}/stat')
+                statm = _read(f'{root}/{pid}/statm')
+            except OSError:
+                # Exited between listdir and open, or not readable
+                continue
+
+            # comm may contain spaces and parentheses, so split after the last ')'
+            lpar = stat.find(b'(')
+            rpar = stat.rfind(b')')
+            fields = stat[rpar + 2:].split()
+
+            if count == self.capacity:
+                self._grow()
+            self.pids[count] = int(pid)
+            self.names[count] = stat[lpar + 1:rpar].decode(errors='replace')
+            self.utime[count] = int(fields[11])
+            self.stime[count] = int(fields[12])
+            self.start_ticks[count] = int(fields[19])
+            self.rss[count] = int(statm.split()[1]) * PAGE_SIZE
+            self.io[count] = _read_io(f'{root}/{pid}/io') if self.read_io else 0
+            count += 1
+
+        self.utime[:count] /= CLOCK_TICKS
+        self.stime[:count] /= CLOCK_TICKS
+        return count
+
+    def _scan_psutil(self):
+        count = 0
+        attrs = ['name', 'cpu_times', 'memory_info', 'create_time']
+        if self.read_io:
+            attrs.append('io_counters')
+        for proc in psutil.process_iter(attrs):
+            info = proc.info
+            if info['memory_info'] is None or info['cpu_times'] is None or info['create_time'] is None:
+                continue
+
+            if count == self.capacity:
+                self._grow()
+            self.pids[count] = proc.pid
+            self.names[count] = info['name']
+            self.utime[count] = info['cpu_times'].user
+            self.stime[count] = info['cpu_times'].system
+            self.start_ticks[count] = round(info['create_time'] * CLOCK_TICKS)
+            self.rss[count] = info['memory_info'].rss
+            io = info.get('io_counters')
+            self.io[count] = io.read_bytes + io.write_bytes if io else 0
+            count += 1
+        return count
+
+
+def _read(path):
+    # Raw fd reads skip the buffered file object open() would build per file
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 4096)
+    finally:
+        os.close(fd)
+
+
+def _read_io(path):
+    # Other users' io files are not readable; rank those processes as idle
+    try:
+        fields = _read(path).split()
+    except OSError:
+        return 0
+    # rchar, wchar, syscr, syscw, read_bytes, write_bytes, ... as "key: value" pairs
+    return int(fields[9]) + int(fields[11])
@@ -0,0 +1,526 @@
+import numpy as np
+import psutil
+from PyQt5.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex, QTimer
+from PyQt5.QtGui import QColor
+
+COLUMNS = ('PID', 'Process Name', 'RAM (MB)', 'CPU (%)', 'Status')
+STATUS_TEXT = ('🟢 LOW', '🟡 MED', '🔴 HIGH')
+STATUS_COLORS = (QColor('#00ff88'), QColor('#ffcc00'), QColor('#ff3333'))
+# Roles that can change while a process keeps its row
+UPDATED_ROLES = [Qt.DisplayRole, Qt.ForegroundRole]
+GPU_COLUMNS = ('PID', 'Name', 'GPU Memory (MB)')
+
+
+def status_level(info):
+    if info.cpu_percent > 50 or info.memory_mb > 500:
+        return 2
+    if info.cpu_percent > 20 or info.memory_mb > 200:
+        return 1
+    return 0
+
+
+def _counters(processes):
+    """(pid, memory_mb, cpu_percent) columns of processes as a 3 x n array."""
+    values = np.array([(info.pid, info.memory_mb, info.cpu_percent) for info in processes], dtype=np.float64)
+    return np.ascontiguousarray(values.reshape(-1, 3).T)
+
+
+def _names(processes):
+    names = np.empty(len(processes), dtype=object)
+    names[:] = [info.name.lower() for info in processes]
+    return names
+
+
+def _runs(rows):
+    """Split sorted row numbers into (first, last) runs of consecutive rows."""
+    runs = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+    return runs
+
+
+def _member(values, pool):
+    """Boolean mask of which entries of values occur in pool."""
+    if not len(pool):
+        return np.zeros(len(values), dtype=bool)
+    pool = np.sort(pool)
+    at = np.searchsorted(pool, values)
+    at[at == len(pool)] = 0
+    return pool[at] == values
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """One row per live process, keyed by (pid, create_time).
+
+    apply() diffs a new process snapshot against the rows already shown and
+    reports only what moved: rowsRemoved for exited processes, one
+    dataChanged spanning the rows whose counters changed, and rowsInserted
+    (at the end) for new ones. The registry reuses a process's ProcessInfo
+    while its counters stay the same, so unchanged rows are found by
+    identity. The sortable columns are mirrored in numpy arrays, so a
+    ProcessSortProxy can compare a whole range of rows without calling back
+    into Python per row. Rows are never reordered here.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.ids = np.zeros(0, dtype=np.uintp)  # id() of each row's ProcessInfo
+        self.values = _counters(())  # pid, memory and CPU of each row
+        self.names = _names(())  # lower-cased, for sorting by name
+        self.inserted = 0
+        self.removed = 0
+        self.changed = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        info = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(info.pid)
+            if column == 1:
+                return info.name
+            if column == 2:
+                return f"{info.memory_mb:.1f}"
+            if column == 3:
+                return f"{info.cpu_percent:.1f}"
+            return STATUS_TEXT[status_level(info)]
+        if role == Qt.ForegroundRole and column == 4:
+            return STATUS_COLORS[status_level(info)]
+        if role == Qt.TextAlignmentRole and column in (0, 2, 3):
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def sort_keys(self, rows, column):
+        """Sort values of column for rows, as an array ProcessSortProxy can search."""
+        if column < 0:
+            return np.zeros(len(rows))
+        if column == 1:
+            return self.names[rows]
+        if column == 4:
+            # status_level over arrays
+            memory, cpu = self.values[1:, rows]
+            return np.where((cpu > 50) | (memory > 500), 2.0, np.where((cpu > 20) | (memory > 200), 1.0, 0.0))
+        return self.values[(0, None, 1, 2)[column], rows]
+
+    def load(self, processes):
+        """Replace every row at once with a model reset."""
+        self.beginResetModel()
+        self.rows = list(processes)
+        self.ids = np.fromiter(map(id, self.rows), dtype=np.uintp, count=len(self.rows))
+        self.values = _counters(self.rows)
+        self.names = _names(self.rows)
+        self.endResetModel()
+        self.inserted += len(self.rows)
+
+    def apply(self, processes):
+        """Bring the rows in line with a tuple of ProcessInfo."""
+        if not self.rows:
+            # Startup: one reset beats diffing against nothing
+            self.load(processes)
+            return
+
+        rows = self.rows
+        # Unchanged processes keep their ProcessInfo object, so comparing
+        # object ids (in numpy, without a Python-level pass over every row)
+        # settles most rows; only the objects that differ are matched by key
+        ids = np.fromiter(map(id, processes), dtype=np.uintp, count=len(processes))
+        fresh = {}
+        for i in np.flatnonzero(~_member(ids, self.ids)).tolist():
+            info = processes[i]
+            fresh[info.pid, info.create_time] = info
+
+        gone = []
+        replaced = []
+        for row in np.flatnonzero(~_member(self.ids, ids)).tolist():
+            info = rows[row]
+            current = fresh.pop((info.pid, info.create_time), None)
+            if current is None:
+                gone.append(row)
+            else:
+                replaced.append((row, current))
+
+        if replaced:
+            changed = np.array([row for row, _ in replaced], dtype=np.intp)
+            current = [info for _, info in replaced]
+            for row, info in replaced:
+                rows[row] = info
+            self.ids[changed] = np.fromiter(map(id, current), dtype=np.uintp, count=len(current))
+            values = _counters(current)
+            # Only memory and CPU are shown; status follows from them
+            moved = changed[(values[1:] != self.values[1:, changed]).any(axis=0)]
+            self.values[:, changed] = values
+            if len(moved):
+                self.dataChanged.emit(self.index(int(moved[0]), 2), self.index(int(moved[-1]), 4), UPDATED_ROLES)
+            self.changed += len(moved)
+
+        if gone:
+            # Bottom-up, so earlier row numbers stay valid
+            for first, last in reversed(_runs(gone)):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del rows[first:last + 1]
+                self.endRemoveRows()
+            self.removed += len(gone)
+            self.ids = np.delete(self.ids, gone)
+            self.values = np.delete(self.values, gone, axis=1)
+            self.names = np.delete(self.names, gone)
+
+        # Whatever is left in fresh was not shown yet
+        if fresh:
+            first = len(rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(fresh) - 1)
+            added = list(fresh.values())
+            rows.extend(added)
+            self.ids = np.concatenate((self.ids, np.fromiter(map(id, added), dtype=np.uintp, count=len(added))))
+            self.values = np.concatenate((self.values, _counters(added)), axis=1)
+            self.names = np.concatenate((self.names, _names(added)))
+            self.endInsertRows()
+            self.inserted += len(fresh)
+
+    def stats(self):
+        return {'rows': len(self.rows), 'inserted': self.inserted, 'removed': self.removed,
+                'changed': self.changed}
+
+
+class ProcessSortProxy(QAbstractProxyModel):
+    """Sorted view of a ProcessTableModel that only re-sorts what changed.
+
+    The sorted order is kept as an array of source rows with their sort keys
+    alongside, ascending; descending order reads it backwards. Exited rows
+    are cut out. The rows a tick changed or added are compared with their
+    stored keys in one vectorized pass, checked against their neighbours,
+    and merged back in with a single layout change if any of them moved;
+    all other rows keep their place without being compared again.
+    QSortFilterProxyModel instead rebuilds its O(n) mapping for every
+    dataChanged it re-sorts, which for thousands of changed rows per tick
+    took hundreds of milliseconds.
+    """
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.sort_column = -1
+        self.sort_order = Qt.AscendingOrder
+        self.order = np.zeros(0, dtype=np.intp)  # source rows, ascending by key
+        self.keys = np.zeros(0)
+        self.position = np.zeros(0, dtype=np.intp)  # source row -> index into order
+        self.source_rows = None  # order as a list, built when first painted
+        self.pending = None  # [first, last] source rows changed since the last flush
+        self.pending_sort = False
+        self.flush_scheduled = False
+        self.resorted = 0
+
+        self.source = source
+        self.setSourceModel(source)
+        source.rowsAboutToBeRemoved.connect(self.on_rows_about_to_be_removed)
+        source.rowsRemoved.connect(self.on_rows_removed)
+        source.rowsInserted.connect(self.on_rows_inserted)
+        source.dataChanged.connect(self.on_data_changed)
+        source.modelReset.connect(self.rebuild)
+        self.rebuild()
+
+    # Index mapping
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self.order) or not 0 <= column < len(COLUMNS):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    # Answered here rather than through mapToSource: the view asks for
+    # these far more often than it paints cells, and rows have no labels
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable if index.isValid() else Qt.NoItemFlags
+
+    def proxy_row(self, i):
+        """Proxy row shown for position i of the ascending order (or an array of them)."""
+        return i if self.sort_order == Qt.AscendingOrder else len(self.order) - 1 - i
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        # Painting maps every visible cell; plain ints index much faster
+        # than numpy scalars
+        if self.source_rows is None:
+            self.source_rows = self.order.tolist()
+        row = proxy_index.row()
+        if self.sort_order != Qt.AscendingOrder:
+            row = len(self.source_rows) - 1 - row
+        return self.source.index(self.source_rows[row], proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        return self.index(int(self.proxy_row(self.position[source_index.row()])), source_index.column())
+
+    def update_positions(self):
+        self.position = np.empty(self.source.rowCount(), dtype=np.intp)
+        self.position[self.order] = np.arange(len(self.order))
+        self.source_rows = None
+
+    # Sorting
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.flush()
+        self.layoutAboutToBeChanged.emit()
+        persistent, sources = self.save_persistent()
+        self.sort_column = column
+        self.sort_order = order
+        self.sort_all()
+        self.restore_persistent(persistent, sources)
+        self.layoutChanged.emit()
+
+    def rebuild(self):
+        self.beginResetModel()
+        self.pending = None
+        self.pending_sort = False
+        self.sort_all()
+        self.endResetModel()
+
+    def sort_all(self):
+        keys = self.source.sort_keys(range(self.source.rowCount()), self.sort_column)
+        self.order = np.argsort(keys, kind='stable')
+        self.keys = keys[self.order]
+        self.update_positions()
+
+    def save_persistent(self):
+        persistent = self.persistentIndexList()
+        return persistent, [(int(self.order[self.proxy_row(index.row())]), index.column()) for index in persistent]
+
+    def restore_persistent(self, persistent, sources):
+        self.changePersistentIndexList(persistent, [
+            self.index(int(self.proxy_row(self.position[row])), column) for row, column in sources
+        ])
+
+    def resort(self, rows):
+        """Move the rows whose sort key changed to their new places."""
+        new_keys = self.source.sort_keys(rows, self.sort_column)
+        indices = self.position[rows]
+        moved = new_keys != self.keys[indices]
+        if moved.any():
+            self.place(rows[moved], new_keys[moved], indices[moved])
+
+    def place(self, rows, new_keys, indices):
+        """Store new_keys for rows (at indices of the order) and restore the sort."""
+        self.keys[indices] = new_keys
+
+        # Sortedness is local: if every changed row still sits between its
+        # neighbours, nothing has to move
+        last = len(self.keys) - 1
+        lower = indices[indices > 0]
+        upper = indices[indices < last]
+        if (self.keys[lower - 1] <= self.keys[lower]).all() and (self.keys[upper] <= self.keys[upper + 1]).all():
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        persistent, sources = self.save_persistent()
+        # The unchanged rows stay sorted; merge the changed ones back in
+        keep = np.ones(len(self.order), dtype=bool)
+        keep[indices] = False
+        by_key = np.argsort(new_keys, kind='stable')
+        keys = self.keys[keep]
+        at = np.searchsorted(keys, new_keys[by_key], side='right')
+        self.order = np.insert(self.order[keep], at, rows[by_key])
+        self.keys = np.insert(keys, at, new_keys[by_key])
+        self.update_positions()
+        self.restore_persistent(persistent, sources)
+        self.layoutChanged.emit()
+        self.resorted += len(rows)
+
+    def flush(self):
+        """Apply the re-sort and repaint collected from dataChanged."""
+        self.flush_scheduled = False
+        if self.pending is None:
+            return
+        rows = np.arange(self.pending[0], self.pending[1] + 1)
+        if self.pending_sort:
+            self.resort(rows)
+        self.pending = None
+        self.pending_sort = False
+        shown = self.proxy_row(self.position[rows])
+        self.dataChanged.emit(self.index(int(shown.min()), 0), self.index(int(shown.max()), len(COLUMNS) - 1),
+                              UPDATED_ROLES)
+
+    # Source changes
+
+    def on_data_changed(self, top_left, bottom_right, roles=()):
+        first, last = top_left.row(), bottom_right.row()
+        if self.pending is None:
+            self.pending = [first, last]
+        else:
+            self.pending = [min(first, self.pending[0]), max(last, self.pending[1])]
+        if top_left.column() <= self.sort_column <= bottom_right.column():
+            self.pending_sort = True
+        # One flush for all the rows a tick reports
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    def on_rows_about_to_be_removed(self, parent, first, last):
+        self.flush()
+        # Highest first, so lower positions stay valid while cutting
+        for start, end in reversed(_runs(np.sort(self.position[first:last + 1]).tolist())):
+            proxy_rows = sorted((int(self.proxy_row(start)), int(self.proxy_row(end))))
+            self.beginRemoveRows(QModelIndex(), *proxy_rows)
+            self.order = np.delete(self.order, np.s_[start:end + 1])
+            self.keys = np.delete(self.keys, np.s_[start:end + 1])
+            # Positions are rebuilt once the source has dropped its rows
+            self.source_rows = None
+            self.endRemoveRows()
+
+    def on_rows_removed(self, parent, first, last):
+        self.order[self.order > last] -= last - first + 1
+        self.update_positions()
+
+    def on_rows_inserted(self, parent, first, last):
+        self.flush()
+        count = last - first + 1
+        if count > len(self.order):
+            # Startup and other bulk loads: one sort beats many inserts
+            self.rebuild()
+            return
+
+        # Append the new rows at the far end of the order in one insert,
+        # then merge them into place with a single layout change
+        self.order[self.order >= first] += count
+        rows = np.arange(first, last + 1)
+        end = len(self.order)
+        proxy_rows = (end, end + count - 1) if self.sort_order == Qt.AscendingOrder else (0, count - 1)
+        self.beginInsertRows(QModelIndex(), *proxy_rows)
+        keys = self.source.sort_keys(rows, self.sort_column)
+        self.order = np.concatenate((self.order, rows))
+        self.keys = np.concatenate((self.keys, keys))
+        self.update_positions()
+        self.endInsertRows()
+        self.place(rows, keys, self.position[rows])
+
+    def stats(self):
+        return {'resorted': self.resorted}
+
+
+class PidNameCache:
+    """pid -> process name, looked up once per process.
+
+    Entries stay until the registry reports the process exited, so a pid
+    reused by a new process is looked up again. Processes that are already
+    gone are not cached.
+    """
+
+    def __init__(self):
+        self.names = {}
+        self.lookups = 0
+
+    def get(self, pid):
+        name = self.names.get(pid)
+        if name is None:
+            self.lookups += 1
+            try:
+                name = psutil.Process(pid).name()
+            except psutil.NoSuchProcess:
+                return "N/A"
+            except psutil.AccessDenied:
+                name = "N/A"
+            self.names[pid] = name
+        return name
+
+    def forget(self, exited):
+        """Drop the names of processes in a snapshot's exited tuple."""
+        for info in exited:
+            self.names.pop(info.pid, None)
+
+
+class GpuProcessModel(QAbstractTableModel):
+    """Processes using a GPU, one row per pid.
+
+    Rows are [pid, name, used_memory_mb] lists updated in place. apply()
+    removes pids that left the device, appends new ones and emits
+    dataChanged only for the cells whose name or memory changed, so a
+    steady set of processes costs no allocations per refresh.
+    """
+
+    def __init__(self, names, parent=None):
+        super().__init__(parent)
+        self.names = names
+        self.rows = []
+        self.changed = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(GPU_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return GPU_COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        pid, name, memory_mb = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(pid)
+            if column == 1:
+                return name
+            return f"{memory_mb:.0f}"
+        if role == Qt.TextAlignmentRole and column != 1:
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def apply(self, processes):
+        """Bring the rows in line with a GpuSample's processes tuple."""
+        latest = {proc.pid: proc for proc in processes}
+        rows = self.rows
+
+        gone = [row for row, entry in enumerate(rows) if entry[0] not in latest]
+        for first, last in reversed(_runs(gone)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del rows[first:last + 1]
+            self.endRemoveRows()
+
+        for row, entry in enumerate(rows):
+            proc = latest.pop(entry[0])
+            # The pid may now belong to a new process
+            name = self.names.get(proc.pid)
+            first = 1 if name != entry[1] else 2
+            if first == 1 or proc.used_memory_mb != entry[2]:
+                entry[1] = name
+                entry[2] = proc.used_memory_mb
+                self.dataChanged.emit(self.index(row, first), self.index(row, 2), [Qt.DisplayRole])
+                self.changed += 1
+
+        if latest:
+            first = len(rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(latest) - 1)
+            rows.extend([proc.pid, self.names.get(proc.pid), proc.used_memory_mb] for proc in latest.values())
+            self.endInsertRows()
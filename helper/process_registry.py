@@ -0,0 +1,123 @@
+from collections import namedtuple
+
+import psutil
+
+from helper.cpu_accounting import CpuAccountant
+from helper.proc_scanner import ProcScanner
+from helper.process_snapshot import ProcessInfo
+
+ProcessDelta = namedtuple('ProcessDelta', ['spawned', 'exited'])
+
+
+class ProcessEntry:
+    """One live process identity with its static attributes read once."""
+    __slots__ = ('process', 'pid', 'start_ticks', 'create_time', 'name', 'exe', 'cmdline', 'username',
+                 'info')
+
+    def __init__(self, process, start_ticks):
+        self.process = process
+        self.pid = process.pid
+        self.start_ticks = start_ticks
+        with process.oneshot():
+            self.create_time = process.create_time()
+            self.name = process.name()
+            self.exe = _optional(process.exe)
+            self.cmdline = tuple(_optional(process.cmdline) or ())
+            self.username = _optional(process.username)
+        self.info = None
+
+    @property
+    def identity(self):
+        return self.pid, self.create_time
+
+
+class ProcessRegistry:
+    """Incrementally tracked process table keyed by (pid, create_time).
+
+    Dynamic counters for every pid come from one ProcScanner pass and CPU%
+    and I/O rates from one CpuAccountant pass over its arrays; a
+    psutil.Process is only created, and static fields read, when an identity
+    first appears. A pid that comes back with a different start time is
+    treated as an exit plus a spawn.
+    """
+
+    def __init__(self, scanner=None, accountant=None):
+        self.scanner = scanner or ProcScanner(read_io=True)
+        self.accountant = accountant or CpuAccountant()
+        self._entries = {}  # pid -> ProcessEntry
+        # pid -> start_ticks of processes psutil could not open; skipped until
+        # the pid exits or is reused instead of being retried every scan
+        self._denied = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entries(self):
+        return list(self._entries.values())
+
+    def get(self, identity):
+        entry = self._entries.get(identity[0])
+        if entry is not None and entry.create_time == identity[1]:
+            return entry
+        return None
+
+    def refresh(self):
+        scan = self.scanner.scan()
+        cpu_percents, io_rates, measured = self.accountant.update(scan.pids, scan.start_ticks,
+                                                                  scan.utime + scan.stime, scan.io)
+
+        spawned = []
+        exited = []
+        live = {}
+        denied = {}
+
+        for pid, start_ticks, rss_bytes, cpu_percent, io_rate, is_measured in zip(
+                scan.pids.tolist(), scan.start_ticks.tolist(), scan.rss.tolist(), cpu_percents.tolist(),
+                io_rates.tolist(), measured.tolist()):
+            entry = self._entries.pop(pid, None)
+            if entry is not None and entry.start_ticks != start_ticks:
+                # pid was reused by a new process
+                exited.append(entry.info)
+                entry = None
+
+            is_new = entry is None
+            if is_new:
+                if self._denied.get(pid) == start_ticks:
+                    denied[pid] = start_ticks
+                    continue
+                try:
+                    entry = ProcessEntry(psutil.Process(pid), start_ticks)
+                except (psutil.AccessDenied, psutil.ZombieProcess):
+                    denied[pid] = start_ticks
+                    continue
+                except psutil.NoSuchProcess:
+                    continue
+
+            memory_mb = rss_bytes / 1024 / 1024
+
+            # Idle processes usually report identical counters; keep the old row
+            info = entry.info
+            if (info is None or info.memory_mb != memory_mb or info.cpu_percent != cpu_percent
+                    or info.io_rate != io_rate or info.measured != is_measured):
+                entry.info = ProcessInfo(pid, entry.name, memory_mb, cpu_percent, entry.create_time, io_rate,
+                                         is_measured)
+
+            live[pid] = entry
+            if is_new:
+                spawned.append(entry.info)
+
+        # Whatever was not seen this tick has exited
+        exited.extend(entry.info for entry in self._entries.values())
+        self._entries = live
+        self._denied = denied
+        return ProcessDelta(tuple(spawned), tuple(info for info in exited if info is not None))
+
+    def snapshot(self):
+        return tuple(entry.info for entry in self._entries.values())
+
+
+def _optional(getter):
+    try:
+        return getter()
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        return None
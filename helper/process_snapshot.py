@@ -0,0 +1,10 @@
+from collections import namedtuple
+
+# One row per process, shared by every consumer of a tick (process tab, usage
+# tracker, performance boost). Keep it a tuple so index-based callers still work.
+# measured is False until the process has been sampled twice; until then its
+# cpu_percent and io_rate are placeholders, not readings.
+ProcessInfo = namedtuple('ProcessInfo',
+                         ['pid', 'name', 'memory_mb', 'cpu_percent', 'create_time', 'io_rate', 'measured'],
+                         defaults=(0.0, 0.0, True))
+
@@ -1,151 +1,501 @@
-import sqlite3
-import psutil
-from datetime import datetime
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from helper.db_writer import DatabaseWriter
+from helper.stats_db import LEGACY_DBS, ProcessNames, connect, connect_readonly, enable_incremental_vacuum, migrate
+
+# Longest span (s) a history query may cover and still be served from a tier;
+# longer ranges fall through to the next, coarser one
+TIER_SPANS = {
+    'raw': 2 * 3600,
+    '1m': 2 * 86400,
+}
+# Pages handed back to the filesystem per compaction pass
+VACUUM_PAGES = 2000
+
+
+# Rollup statements shared by the manual methods and the day rollover; they
+# run inside the caller's transaction and replace any rows already present
+# for the days they cover, so running one twice is harmless
+def roll_up_days(conn, first, last):
+    conn.execute("DELETE FROM daily_process_stats WHERE date BETWEEN ? AND ?", (first, last))
+    conn.execute("""
+    INSERT INTO daily_process_stats (date, name_id, total_time_in_top5_sec, average_memory_mb)
+    SELECT date, name_id, time_in_top5_sec, memory_sum_mb / samples
+    FROM process_day_totals
+    WHERE date BETWEEN ? AND ?
+    ORDER BY date, name_id
+    """, (first, last))
+
+
+def summarize_days(conn, first, last):
+    # Top process of each day by time in top 5, from the day's overall rollup
+    conn.execute("DELETE FROM daily_summary WHERE date BETWEEN ? AND ?", (first, last))
+    conn.execute("""
+    INSERT INTO daily_summary (date, name_id, total_time_in_top5_sec, average_memory_mb)
+    SELECT date, name_id, total_time_in_top5_sec, average_memory_mb
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY date ORDER BY total_time_in_top5_sec DESC) AS rank
+        FROM daily_process_stats
+        WHERE date BETWEEN ? AND ?
+    )
+    WHERE rank = 1
+    ORDER BY date
+    """, (first, last))
+
+
+def trim_history(conn):
+    # Keep only last 10 days of history
+    conn.execute("""
+    DELETE FROM daily_summary
+    WHERE date NOT IN (
+        SELECT date FROM daily_summary
+        ORDER BY date DESC LIMIT 10
+    )
+    """)
+
+
+class TopProcessStats:
+    """Today's running totals for one process identity while it is in the top 5."""
+    __slots__ = ('name', 'time_in_top5', 'total_memory', 'samples')
+
+    def __init__(self, name):
+        self.name = name
+        self.time_in_top5 = 0.0
+        self.total_memory = 0.0
+        self.samples = 0
+
 
 class ProcessStatsTracker:
     def __init__(self,
-                 current_db='current_day.db',
-                 overall_db='overall.db',
-                 history_db='history.db'):
-        # Setup database connections
-        self.current_conn = sqlite3.connect(current_db)
-        self.overall_conn = sqlite3.connect(overall_db)
-        self.history_conn = sqlite3.connect(history_db)
-
-        self.current_cursor = self.current_conn.cursor()
-        self.overall_cursor = self.overall_conn.cursor()
-        self.history_cursor = self.history_conn.cursor()
-
-        # In-memory process stats
-        self.process_stats = {}
+                 db_path='insightos.db',
+                 legacy_dbs=LEGACY_DBS,
+                 flush_interval=10.0,
+                 flush_rows=500,
+                 max_pending_rows=5000,
+                 raw_retention=2 * 86400,
+                 minute_retention=30 * 86400,
+                 compact_interval=300.0,
+                 max_tracked=256):
+        # Setup database connection; it is only read from after setup,
+        # every write goes through the writer thread's own connection
+        self.db_path = db_path
+        self.conn = connect(db_path)
+        self.legacy_dbs = legacy_dbs
+
+        # In-memory process stats keyed by (pid, create_time) so reused pids stay distinct,
+        # least recently in the top 5 first. Exited processes are dropped and the
+        # map is capped at max_tracked; every sample was already folded into
+        # process_day_totals when its row was written, so eviction loses nothing
+        # from the daily aggregates, only the identity's running time_in_top5
+        self.process_stats = OrderedDict()
+        self.max_tracked = max_tracked
+        self.names = ProcessNames()
+        self.evicted_exited = 0
+        self.evicted_lru = 0
         print("creating databases")
         # Create tables if not exist
         self.setup_databases()
         print("database creation completed")
 
+        self.writer = DatabaseWriter(db_path)
+        self.writer.start()
+
+        # Per-tick rows are buffered and handed to the writer every
+        # flush_interval seconds or flush_rows rows, whichever comes first.
+        # If the writer's queue is full they stay here and ride along with the
+        # next batch; beyond max_pending_rows the oldest rows are dropped.
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self.max_pending_rows = max_pending_rows
+        self.pending_rows = []
+        self.last_flush = time.monotonic()
+        self.coalesced_rows = 0
+        self.coalesced_pending = 0  # rows in pending_rows already counted as coalesced
+        self.dropped_rows = 0
+        self.deferred_jobs = []
+
+        # Raw samples are rolled up into minute and hour tiers every
+        # compact_interval seconds; raw rows older than raw_retention and
+        # minute rows older than minute_retention are then deleted
+        self.raw_retention = raw_retention
+        self.minute_retention = minute_retention
+        self.compact_interval = compact_interval
+        self.last_compact = time.monotonic()
+
+        # Fetch results are cached per query together with the write
+        # generation of every table they read; writer jobs bump the
+        # generations after committing, so a cached result is reused
+        # exactly until one of its tables changes
+        self.generations = dict.fromkeys(('process_stats', 'process_day_totals', 'process_stats_1m',
+                                          'process_stats_1h', 'daily_process_stats', 'daily_summary'), 0)
+        self.query_cache = {}
+        self.peak_rows = self.peaks = ()  # fetch_peak_memory's last fold
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self.rollover()
+
     def setup_databases(self):
-        self.current_cursor.execute("""
-        CREATE TABLE IF NOT EXISTS process_stats (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            process_name TEXT,
-            memory_usage_mb REAL,
-            time_in_top5 INTEGER
-        )
-        """)
-
-        self.overall_cursor.execute("""
-        CREATE TABLE IF NOT EXISTS daily_process_stats (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT,
-            process_name TEXT,
-            total_time_in_top5_sec INTEGER,
-            average_memory_mb REAL
-        )
-        """)
-
-        self.history_cursor.execute("""
-        CREATE TABLE IF NOT EXISTS daily_summary (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT,
-            top_process_name TEXT,
-            total_time_in_top5_sec INTEGER,
-            average_memory_mb REAL
-        )
-        """)
-
-        self.current_conn.commit()
-        self.overall_conn.commit()
-        self.history_conn.commit()
-
-    def log_top_processes(self):
-        # Get all processes with pid, name, and memory usage
-        processes = [(p.info['pid'], p.info['name'], p.info['memory_info'].rss / 1024 / 1024)
-                     for p in psutil.process_iter(['pid', 'name', 'memory_info'])]
-
-        # Sort and pick top 5 by memory usage
-        top5 = sorted(processes, key=lambda x: x[2], reverse=True)[:5]
-
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-        for pid, name, mem_usage in top5:
-            if pid not in self.process_stats:
-                self.process_stats[pid] = {'name': name, 'time_in_top5': 0, 'total_memory': 0, 'samples': 0}
-
-            self.process_stats[pid]['time_in_top5'] += 1
-            self.process_stats[pid]['total_memory'] += mem_usage
-            self.process_stats[pid]['samples'] += 1
-
-            avg_mem = self.process_stats[pid]['total_memory'] / self.process_stats[pid]['samples']
-
-            self.current_cursor.execute("""
-            INSERT INTO process_stats (timestamp, process_name, memory_usage_mb, time_in_top5)
-            VALUES (?, ?, ?, ?)
-            """, (timestamp, name, mem_usage, self.process_stats[pid]['time_in_top5']))
-
-        self.current_conn.commit()
-
-    def flush_daily_stats_to_overall(self):
-        date_today = datetime.now().strftime('%Y-%m-%d')
-
-        for pid, stats in self.process_stats.items():
-            avg_mem = stats['total_memory'] / stats['samples']
-
-            self.overall_cursor.execute("""
-            INSERT INTO daily_process_stats (date, process_name, total_time_in_top5_sec, average_memory_mb)
-            VALUES (?, ?, ?, ?)
-            """, (date_today, stats['name'], stats['time_in_top5'], avg_mem))
-
-        self.overall_conn.commit()
-
-    def save_daily_summary_to_history(self):
-        date_today = datetime.now().strftime('%Y-%m-%d')
-
-        if not self.process_stats:
-            print("No data to summarize.")
+        # Creates the schema on first run, importing the old per-table
+        # files if they are present, and applies any newer migrations
+        migrate(self.conn, self.legacy_dbs)
+        enable_incremental_vacuum(self.conn)
+
+    def submit(self, job, rows=0):
+        # Maintenance jobs must not be lost, so a full queue defers them
+        # to a later submission or flush instead of dropping them
+        if not self.drain_deferred() or not self.writer.submit(job, rows):
+            self.deferred_jobs.append((job, rows))
+
+    def drain_deferred(self):
+        """Hand deferred jobs to the writer in order; True once none are left."""
+        while self.deferred_jobs:
+            if not self.writer.submit(*self.deferred_jobs[0]):
+                return False
+            self.deferred_jobs.pop(0)
+        return True
+
+    def bump(self, *tables):
+        # Called on the writer thread once a job has committed
+        for table in tables:
+            self.generations[table] += 1
+
+    def generation(self, *tables):
+        """Write generation of each table; changes whenever one of them is written."""
+        return tuple(self.generations[table] for table in tables)
+
+    def open_reader(self):
+        """Read-only connection for a thread that runs the fetch methods."""
+        return connect_readonly(self.db_path)
+
+    def cached_query(self, key, tables, query, params=(), conn=None):
+        """Run query unless the result cached under key was read with the
+        same params at the current generation of every table in tables.
+
+        Unchanged data comes back as the same tuple object, so callers can
+        skip redrawing when the result is the one they drew last.
+        """
+        # Read the generations first: a write landing mid-query then only
+        # costs one extra query next time instead of a stale hit
+        generation = self.generation(*tables)
+        entry = self.query_cache.get(key)
+        if entry is not None and entry[0] == generation and entry[1] == params:
+            self.cache_hits += 1
+            return entry[2]
+
+        self.cache_misses += 1
+        data = tuple((conn or self.conn).execute(query, params).fetchall())
+        self.query_cache[key] = (generation, params, data)
+        return data
+
+    def log_top_processes(self, top5, interval=1.0, exited=()):
+        # top5 is the collector's memory ranking (ProcessInfo rows, largest
+        # first), interval the seconds the sample covers and exited the
+        # processes that went away since the previous one
+        for proc in exited:
+            if self.process_stats.pop((proc.pid, proc.create_time), None) is not None:
+                self.evicted_exited += 1
+
+        now = datetime.now()
+        timestamp = int(now.timestamp())
+        day = now.strftime('%Y-%m-%d')
+        if day != self.current_day:
+            self.rollover(day)
+
+        for proc in top5:
+            name, mem_usage = proc.name, proc.memory_mb
+            key = (proc.pid, proc.create_time)
+            stats = self.process_stats.get(key)
+            if stats is None:
+                stats = self.process_stats[key] = TopProcessStats(name)
+                if len(self.process_stats) > self.max_tracked:
+                    self.process_stats.popitem(last=False)
+                    self.evicted_lru += 1
+            else:
+                self.process_stats.move_to_end(key)
+
+            stats.time_in_top5 += interval
+            stats.total_memory += mem_usage
+            stats.samples += 1
+
+            self.pending_rows.append((timestamp, day, name, mem_usage, stats.time_in_top5, interval))
+
+        if len(self.pending_rows) >= self.flush_rows or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+        if time.monotonic() - self.last_compact >= self.compact_interval:
+            self.compact()
+
+    def flush(self, block=False):
+        self.last_flush = time.monotonic()
+        # Runs every flush_interval, so deferred jobs go out even when no
+        # new maintenance job is submitted behind them
+        self.drain_deferred()
+        if not self.pending_rows:
+            return
+
+        rows = self.pending_rows
+
+        def write_rows(conn):
+            name_ids = self.names.intern(conn, [row[2] for row in rows])
+            samples = []
+            # Fold the batch into one UPSERT per (day, process) for the totals table
+            totals = {}
+            for timestamp, day, name, mem_usage, time_in_top5, interval in rows:
+                name_id = name_ids[name]
+                samples.append((timestamp, name_id, mem_usage, time_in_top5, interval))
+                total = totals.setdefault((day, name_id), [0.0, 0.0, 0])
+                total[0] += interval
+                total[1] += mem_usage
+                total[2] += 1
+
+            with conn:
+                conn.executemany("""
+                INSERT INTO process_stats (timestamp, name_id, memory_usage_mb, time_in_top5, sample_interval)
+                VALUES (?, ?, ?, ?, ?)
+                """, samples)
+                conn.executemany("""
+                INSERT INTO process_day_totals (date, name_id, time_in_top5_sec, memory_sum_mb, samples)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (date, name_id) DO UPDATE SET
+                    time_in_top5_sec = time_in_top5_sec + excluded.time_in_top5_sec,
+                    memory_sum_mb = memory_sum_mb + excluded.memory_sum_mb,
+                    samples = samples + excluded.samples
+                """, [(day, name_id, *total) for (day, name_id), total in totals.items()])
+            self.bump('process_stats', 'process_day_totals')
+
+        if self.writer.submit(write_rows, len(rows), block=block):
+            self.pending_rows = []
+            self.coalesced_pending = 0
             return
 
-        # Find top process by time_in_top5
-        top_pid = max(self.process_stats.items(), key=lambda x: x[1]['time_in_top5'])[0]
-        top_process = self.process_stats[top_pid]
-        avg_mem = top_process['total_memory'] / top_process['samples']
+        # Writer is backed up: keep the rows for the next batch, counting
+        # only those that were not already held back by an earlier attempt
+        self.coalesced_rows += len(rows) - self.coalesced_pending
+        overflow = len(rows) - self.max_pending_rows
+        if overflow > 0:
+            self.dropped_rows += overflow
+            del rows[:overflow]
+        self.coalesced_pending = len(rows)
+
+    def compact(self):
+        self.last_compact = time.monotonic()
+        # Rows still buffered here must reach the raw table before their minute is rolled up
+        self.flush()
+
+        now = int(time.time())
+        # Leave the last minute alone so rows still in flight are not cut off,
+        # and stop short of the oldest row a full queue kept in pending_rows:
+        # a bucket behind the watermark is never rolled up again
+        minute_cutoff = now - 60 - now % 60
+        if self.pending_rows:
+            oldest = self.pending_rows[0][0]
+            minute_cutoff = min(minute_cutoff, oldest - oldest % 60)
+        hour_cutoff = minute_cutoff - minute_cutoff % 3600
+        raw_expiry = now - self.raw_retention
+        minute_expiry = now - self.minute_retention
+
+        def compact_tiers(conn):
+            with conn:
+                rolled = dict(conn.execute("SELECT tier, rolled_until FROM rollup_state"))
+                conn.execute("""
+                INSERT INTO process_stats_1m
+                    (bucket, name_id, memory_min_mb, memory_avg_mb, memory_max_mb, samples, time_in_top5_sec)
+                SELECT timestamp - timestamp % 60, name_id,
+                       MIN(memory_usage_mb), AVG(memory_usage_mb), MAX(memory_usage_mb),
+                       COUNT(*), SUM(sample_interval)
+                FROM process_stats
+                WHERE timestamp >= ? AND timestamp < ?
+                GROUP BY 1, 2
+                ON CONFLICT (bucket, name_id) DO UPDATE SET
+                    memory_min_mb = MIN(memory_min_mb, excluded.memory_min_mb),
+                    memory_avg_mb = (memory_avg_mb * samples + excluded.memory_avg_mb * excluded.samples)
+                                    / (samples + excluded.samples),
+                    memory_max_mb = MAX(memory_max_mb, excluded.memory_max_mb),
+                    samples = samples + excluded.samples,
+                    time_in_top5_sec = time_in_top5_sec + excluded.time_in_top5_sec
+                """, (rolled['1m'], minute_cutoff))
+                conn.execute("""
+                INSERT INTO process_stats_1h
+                    (bucket, name_id, memory_min_mb, memory_avg_mb, memory_max_mb, samples, time_in_top5_sec)
+                SELECT bucket - bucket % 3600, name_id,
+                       MIN(memory_min_mb), SUM(memory_avg_mb * samples) / SUM(samples), MAX(memory_max_mb),
+                       SUM(samples), SUM(time_in_top5_sec)
+                FROM process_stats_1m
+                WHERE bucket >= ? AND bucket < ?
+                GROUP BY 1, 2
+                ON CONFLICT (bucket, name_id) DO UPDATE SET
+                    memory_min_mb = MIN(memory_min_mb, excluded.memory_min_mb),
+                    memory_avg_mb = (memory_avg_mb * samples + excluded.memory_avg_mb * excluded.samples)
+                                    / (samples + excluded.samples),
+                    memory_max_mb = MAX(memory_max_mb, excluded.memory_max_mb),
+                    samples = samples + excluded.samples,
+                    time_in_top5_sec = time_in_top5_sec + excluded.time_in_top5_sec
+                """, (rolled['1h'], hour_cutoff))
+                conn.executemany("UPDATE rollup_state SET rolled_until = MAX(rolled_until, ?) WHERE tier = ?",
+                                 [(minute_cutoff, '1m'), (hour_cutoff, '1h')])
+
+                # Never delete rows the next tier has not absorbed yet
+                conn.execute("DELETE FROM process_stats WHERE timestamp < ?", (min(raw_expiry, minute_cutoff),))
+                conn.execute("DELETE FROM process_stats_1m WHERE bucket < ?", (min(minute_expiry, hour_cutoff),))
+            self.bump('process_stats', 'process_stats_1m', 'process_stats_1h')
+            conn.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES})").fetchall()
+
+        self.submit(compact_tiers)
+
+    def rollover(self, today=None):
+        """Close out every finished day not rolled up yet: overall rows, the
+        daily summary and history retention in one transaction on the writer.
+
+        Runs at startup, so days that passed while the app was closed are
+        caught up, and whenever a sample lands on a new local date.
+        """
+        today = self.current_day = today or datetime.now().strftime('%Y-%m-%d')
+        # Yesterday's buffered rows must be written before its totals are read
+        self.flush()
+        # time_in_top5 and the memory averages are per day
+        self.process_stats.clear()
 
-        self.history_cursor.execute("""
-        INSERT INTO daily_summary (date, top_process_name, total_time_in_top5_sec, average_memory_mb)
-        VALUES (?, ?, ?, ?)
-        """, (date_today, top_process['name'], top_process['time_in_top5'], avg_mem))
+        def roll_over_days(conn):
+            with conn:
+                rolled_until, first, last = conn.execute("""
+                SELECT rolled_until, MIN(date), date(?, '-1 day')
+                FROM rollup_state LEFT JOIN process_day_totals ON date > rolled_until AND date < ?
+                WHERE tier = 'day'
+                """, (today, today)).fetchone()
+                if first is not None:
+                    roll_up_days(conn, first, last)
+                    summarize_days(conn, first, last)
+                    trim_history(conn)
+                if last > rolled_until:
+                    conn.execute("UPDATE rollup_state SET rolled_until = ? WHERE tier = 'day'", (last,))
+            if first is not None:
+                self.bump('daily_process_stats', 'daily_summary')
 
-        self.history_conn.commit()
+        self.submit(roll_over_days)
+        # Retention for the sample tiers
+        self.compact()
+
+    def flush_daily_stats_to_overall(self, date=None):
+        date = date or datetime.now().strftime('%Y-%m-%d')
+        # Hand buffered rows to the writer first so the rollup sees them
+        self.flush()
+
+        def write_overall(conn):
+            with conn:
+                roll_up_days(conn, date, date)
+            self.bump('daily_process_stats')
+
+        self.submit(write_overall)
+
+    def save_daily_summary_to_history(self, date=None):
+        date = date or datetime.now().strftime('%Y-%m-%d')
+
+        def write_summary(conn):
+            with conn:
+                summarize_days(conn, date, date)
+            self.bump('daily_summary')
+
+        self.submit(write_summary)
 
     def cleanup_history_limit(self):
-        # Keep only last 10 days of history
-        self.history_cursor.execute("""
-        DELETE FROM daily_summary
-        WHERE date NOT IN (
-            SELECT date FROM daily_summary
-            ORDER BY date DESC LIMIT 10
-        )
-        """)
-        self.history_conn.commit()
+        def delete_old_history(conn):
+            with conn:
+                trim_history(conn)
+            self.bump('daily_summary')
+
+        self.submit(delete_old_history)
+
+    def writer_stats(self):
+        stats = self.writer.stats()
+        stats.update({
+            'pending_rows': len(self.pending_rows),
+            'coalesced_rows': self.coalesced_rows,
+            'dropped_rows': self.dropped_rows,
+            'deferred_jobs': len(self.deferred_jobs),
+            'tracked_processes': len(self.process_stats),
+            'evicted_exited': self.evicted_exited,
+            'evicted_lru': self.evicted_lru,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        })
+        return stats
 
     # Fetch methods
-    def fetch_current_day_stats(self):
-        self.current_cursor.execute("SELECT process_name, SUM(time_in_top5) FROM process_stats GROUP BY process_name")
-        data = self.current_cursor.fetchall()
-        return data
+    def fetch_current_day_stats(self, date=None, conn=None):
+        date = date or datetime.now().strftime('%Y-%m-%d')
+        # Reads the running totals, so the cost is per process, not per sample
+        return self.cached_query(('current_day', date), ('process_day_totals',), """
+        SELECT n.name, t.time_in_top5_sec
+        FROM process_day_totals AS t JOIN process_names AS n ON n.id = t.name_id
+        WHERE t.date = ?
+        ORDER BY n.name
+        """, (date,), conn)
 
-    def fetch_overall_stats(self):
-        self.overall_cursor.execute("SELECT process_name, SUM(total_time_in_top5_sec) FROM daily_process_stats GROUP BY process_name")
-        data = self.overall_cursor.fetchall()
-        return data
+    def fetch_memory_history(self, start, end, process_name=None, conn=None):
+        """Memory use between two datetimes as (bucket, process_name, min, avg,
+        max, samples) rows, read from the finest tier that covers the range."""
+        span = (end - start).total_seconds()
+        age = (datetime.now() - start).total_seconds()
+        params = (int(start.timestamp()), int(end.timestamp()), process_name, process_name)
 
-    def fetch_daily_history_stats(self):
-        self.history_cursor.execute("SELECT date, total_time_in_top5_sec FROM daily_summary ORDER BY date")
-        data = self.history_cursor.fetchall()
-        return data
+        if span <= TIER_SPANS['raw'] and age <= self.raw_retention:
+            return self.cached_query(('memory_history', 'raw'), ('process_stats',), """
+            SELECT datetime(s.timestamp, 'unixepoch', 'localtime'), n.name,
+                   s.memory_usage_mb, s.memory_usage_mb, s.memory_usage_mb, 1
+            FROM process_stats AS s JOIN process_names AS n ON n.id = s.name_id
+            WHERE s.timestamp >= ? AND s.timestamp < ? AND (? IS NULL OR n.name = ?)
+            ORDER BY s.timestamp
+            """, params, conn)
+
+        tier = '1m' if span <= TIER_SPANS['1m'] and age <= self.minute_retention else '1h'
+        return self.cached_query(('memory_history', tier), (f'process_stats_{tier}',), f"""
+        SELECT datetime(t.bucket, 'unixepoch', 'localtime'), n.name,
+               t.memory_min_mb, t.memory_avg_mb, t.memory_max_mb, t.samples
+        FROM process_stats_{tier} AS t JOIN process_names AS n ON n.id = t.name_id
+        WHERE t.bucket >= ? AND t.bucket < ? AND (? IS NULL OR n.name = ?)
+        ORDER BY t.bucket
+        """, params, conn)
+
+    def fetch_peak_memory(self, hours=24, conn=None):
+        """(process_name, peak memory MB) for the ten largest peaks over the
+        last hours, folded from fetch_memory_history."""
+        # Whole minutes, so the window and its cached rows move once a minute
+        end = datetime.now().replace(second=0, microsecond=0)
+        rows = self.fetch_memory_history(end - timedelta(hours=hours), end, conn=conn)
+        # Same rows, same tuple: lets the chart skip redrawing
+        if rows is not self.peak_rows:
+            peaks = {}
+            for _, name, _, _, peak, _ in rows:
+                peaks[name] = max(peak, peaks.get(name, 0.0))
+            self.peak_rows = rows
+            self.peaks = tuple(sorted(peaks.items(), key=lambda item: item[1], reverse=True)[:10])
+        return self.peaks
+
+    def fetch_overall_stats(self, conn=None):
+        # Aggregate on the integer ids, then resolve one name per group
+        return self.cached_query('overall', ('daily_process_stats',), """
+        SELECT n.name, t.total
+        FROM (
+            SELECT name_id, SUM(total_time_in_top5_sec) AS total
+            FROM daily_process_stats
+            GROUP BY name_id
+        ) AS t JOIN process_names AS n ON n.id = t.name_id
+        ORDER BY n.name
+        """, conn=conn)
+
+    def fetch_daily_history_stats(self, conn=None):
+        return self.cached_query('history', ('daily_summary',),
+                                 "SELECT date, total_time_in_top5_sec FROM daily_summary ORDER BY date", conn=conn)
 
     # Optional: Close connections on cleanup
     def close(self):
-        self.current_conn.close()
-        self.overall_conn.close()
-        self.history_conn.close()
+        # Queued jobs and buffered rows must reach disk before shutdown,
+        # in the order they were produced
+        for job, rows in self.deferred_jobs:
+            self.writer.submit(job, rows, block=True)
+        self.deferred_jobs = []
+        self.flush(block=True)
+        self.writer.stop()
+        self.conn.close()
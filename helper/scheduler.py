@@ -0,0 +1,113 @@
+import math
+import time
+
+
+class ScheduledCollector:
+    """One named collection job with its own period and cost accounting."""
+    __slots__ = ('name', 'func', 'period', 'scaled', 'next_due', 'last_run', 'runs', 'missed',
+                 'total_cost', 'last_cost', 'errors')
+
+    def __init__(self, name, func, period, scaled):
+        self.name = name
+        self.func = func
+        self.period = period  # None runs once
+        self.scaled = scaled
+        self.next_due = 0.0
+        self.last_run = None
+        self.runs = 0
+        self.missed = 0
+        self.total_cost = 0.0
+        self.last_cost = 0.0
+        self.errors = 0
+
+
+class MultiRateScheduler:
+    """Runs collectors at their own periods from a single thread.
+
+    Periods of 'scaled' collectors are multiplied by the current scale, which
+    lets the adaptive rate controller speed up or slow down live metrics
+    without touching slow ones like disk usage. A collector that falls a
+    whole period or more behind counts the skipped runs as missed deadlines
+    and is rescheduled from now rather than replayed.
+    """
+
+    def __init__(self, clock=time.monotonic, slack=0.05):
+        self._clock = clock
+        self.slack = slack  # collectors due this close together share one run
+        self._collectors = []
+        self.scale = 1.0
+
+    def add(self, name, func, period=None, scaled=True):
+        collector = ScheduledCollector(name, func, period, scaled)
+        collector.next_due = self._clock()
+        self._collectors.append(collector)
+        return collector
+
+    def _period(self, collector):
+        return collector.period * self.scale if collector.scaled else collector.period
+
+    def set_scale(self, scale):
+        if scale == self.scale:
+            return
+        self.scale = scale
+        for collector in self._collectors:
+            if collector.scaled and collector.period is not None and collector.last_run is not None:
+                collector.next_due = collector.last_run + self._period(collector)
+
+    def reset(self):
+        """Make every periodic collector due immediately."""
+        now = self._clock()
+        for collector in self._collectors:
+            if collector.period is not None:
+                collector.next_due = now
+
+    def next_deadline(self):
+        return min((c.next_due for c in self._collectors if c.next_due is not None), default=None)
+
+    def run_due(self):
+        """Run every collector whose deadline has passed; returns {name: result}."""
+        results = {}
+        now = self._clock()
+        for collector in self._collectors:
+            if collector.next_due is None or collector.next_due > now + self.slack:
+                continue
+
+            started = self._clock()
+            try:
+                results[collector.name] = collector.func()
+            except Exception as e:
+                collector.errors += 1
+                print(f"Error in {collector.name} collector: {e}")
+            finished = self._clock()
+
+            collector.runs += 1
+            collector.last_cost = finished - started
+            collector.total_cost += collector.last_cost
+            collector.last_run = started
+
+            if collector.period is None:
+                collector.next_due = None
+                continue
+
+            period = self._period(collector)
+            lateness = started - collector.next_due
+            if lateness >= period:
+                collector.missed += int(lateness // period)
+                collector.next_due = started + period
+            else:
+                collector.next_due += period
+        return results
+
+    def stats(self):
+        rows = []
+        for c in self._collectors:
+            rows.append({
+                'name': c.name,
+                'period': None if c.period is None else self._period(c),
+                'runs': c.runs,
+                'missed': c.missed,
+                'errors': c.errors,
+                'last_ms': c.last_cost * 1000,
+                'avg_ms': c.total_cost / c.runs * 1000 if c.runs else math.nan,
+            })
+        return tuple(rows)
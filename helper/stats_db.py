@@ -0,0 +1,382 @@
+import os
+import pathlib
+import sqlite3
+
+# Files written by the tracker before everything moved into one database;
+# migration 1 imports whichever of them exist next to the new store
+LEGACY_DBS = {
+    'current': 'current_day.db',
+    'overall': 'overall.db',
+    'history': 'history.db',
+}
+
+
+def connect(path):
+    conn = sqlite3.connect(path)
+    # WAL commits append to the log instead of syncing a rollback journal;
+    # NORMAL only fsyncs at checkpoints and stays consistent on power loss
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def connect_readonly(path):
+    # Under WAL a reader sees the last committed state without blocking the writer
+    conn = sqlite3.connect(pathlib.Path(path).absolute().as_uri() + '?mode=ro', uri=True)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def _has_table(conn, schema, table):
+    return conn.execute(f"SELECT 1 FROM {schema}.sqlite_master WHERE type='table' AND name=?",
+                        (table,)).fetchone() is not None
+
+
+def migrate_v1(conn, legacy):
+    """Create the merged schema and copy rows over from the per-table files."""
+    conn.execute("""
+    CREATE TABLE process_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        process_name TEXT,
+        memory_usage_mb REAL,
+        time_in_top5 INTEGER,
+        sample_interval REAL DEFAULT 1.0
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE daily_process_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT,
+        process_name TEXT,
+        total_time_in_top5_sec INTEGER,
+        average_memory_mb REAL
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE daily_summary (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT,
+        top_process_name TEXT,
+        total_time_in_top5_sec INTEGER,
+        average_memory_mb REAL
+    )
+    """)
+
+    if 'current' in legacy and _has_table(conn, 'current', 'process_stats'):
+        # Files from before adaptive sampling have no interval column
+        columns = [row[1] for row in conn.execute("PRAGMA current.table_info(process_stats)")]
+        interval = 'sample_interval' if 'sample_interval' in columns else '1.0'
+        conn.execute(f"""
+        INSERT INTO process_stats (timestamp, process_name, memory_usage_mb, time_in_top5, sample_interval)
+        SELECT timestamp, process_name, memory_usage_mb, time_in_top5, {interval}
+        FROM current.process_stats ORDER BY id
+        """)
+    if 'overall' in legacy and _has_table(conn, 'overall', 'daily_process_stats'):
+        conn.execute("""
+        INSERT INTO daily_process_stats (date, process_name, total_time_in_top5_sec, average_memory_mb)
+        SELECT date, process_name, total_time_in_top5_sec, average_memory_mb
+        FROM overall.daily_process_stats ORDER BY id
+        """)
+    if 'history' in legacy and _has_table(conn, 'history', 'daily_summary'):
+        conn.execute("""
+        INSERT INTO daily_summary (date, top_process_name, total_time_in_top5_sec, average_memory_mb)
+        SELECT date, top_process_name, total_time_in_top5_sec, average_memory_mb
+        FROM history.daily_summary ORDER BY id
+        """)
+
+
+def migrate_v2(conn, legacy):
+    """Per-(day, process) totals kept up to date as rows are written, plus
+    covering indexes so no Usage-tab query has to touch the table rows."""
+    conn.execute("""
+    CREATE TABLE process_day_totals (
+        date TEXT,
+        process_name TEXT,
+        time_in_top5_sec REAL,
+        memory_sum_mb REAL,
+        samples INTEGER,
+        PRIMARY KEY (date, process_name)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("""
+    INSERT INTO process_day_totals (date, process_name, time_in_top5_sec, memory_sum_mb, samples)
+    SELECT date(timestamp), process_name, SUM(sample_interval), SUM(memory_usage_mb), COUNT(*)
+    FROM process_stats
+    GROUP BY date(timestamp), process_name
+    """)
+    conn.execute("""
+    CREATE INDEX process_stats_by_time
+    ON process_stats (timestamp, process_name, memory_usage_mb, sample_interval)
+    """)
+    conn.execute("""
+    CREATE INDEX daily_process_stats_by_name
+    ON daily_process_stats (process_name, total_time_in_top5_sec)
+    """)
+    conn.execute("""
+    CREATE INDEX daily_summary_by_date
+    ON daily_summary (date, total_time_in_top5_sec)
+    """)
+
+
+def migrate_v3(conn, legacy):
+    """Minute and hour rollup tiers for process_stats, and the watermarks
+    recording how far each tier has been rolled up."""
+    for tier in ('1m', '1h'):
+        conn.execute(f"""
+        CREATE TABLE process_stats_{tier} (
+            bucket TEXT,
+            process_name TEXT,
+            memory_min_mb REAL,
+            memory_avg_mb REAL,
+            memory_max_mb REAL,
+            samples INTEGER,
+            time_in_top5_sec REAL,
+            PRIMARY KEY (bucket, process_name)
+        ) WITHOUT ROWID
+        """)
+    conn.execute("""
+    CREATE TABLE rollup_state (
+        tier TEXT PRIMARY KEY,
+        rolled_until TEXT
+    )
+    """)
+    conn.execute("INSERT INTO rollup_state (tier, rolled_until) VALUES ('1m', ''), ('1h', '')")
+
+
+def migrate_v4(conn, legacy):
+    """Watermark for the day rollover; days already in the overall table count as rolled."""
+    conn.execute("""
+    INSERT INTO rollup_state (tier, rolled_until)
+    SELECT 'day', COALESCE(MAX(date), '') FROM daily_process_stats
+    """)
+
+
+def _epoch(column):
+    # Stored timestamps are local wall-clock text; 'utc' converts them from local time
+    return f"CAST(strftime('%s', {column}, 'utc') AS INTEGER)"
+
+
+def migrate_v5(conn, legacy):
+    """Intern process names into process_names and store sample times and
+    tier buckets as integer epoch seconds. Day-level tables keep their local
+    'YYYY-MM-DD' date, which is what the rollover and charts group by."""
+    conn.execute("""
+    CREATE TABLE process_names (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+    """)
+    conn.execute("""
+    INSERT INTO process_names (name)
+    SELECT name FROM (
+        SELECT process_name AS name FROM process_stats
+        UNION SELECT process_name FROM process_day_totals
+        UNION SELECT process_name FROM process_stats_1m
+        UNION SELECT process_name FROM process_stats_1h
+        UNION SELECT process_name FROM daily_process_stats
+        UNION SELECT top_process_name FROM daily_summary
+    )
+    WHERE name IS NOT NULL
+    ORDER BY name
+    """)
+
+    conn.execute("""
+    CREATE TABLE process_stats_new (
+        id INTEGER PRIMARY KEY,
+        timestamp INTEGER,
+        name_id INTEGER REFERENCES process_names (id),
+        memory_usage_mb REAL,
+        time_in_top5 REAL,
+        sample_interval REAL DEFAULT 1.0
+    )
+    """)
+    conn.execute(f"""
+    INSERT INTO process_stats_new (timestamp, name_id, memory_usage_mb, time_in_top5, sample_interval)
+    SELECT {_epoch('s.timestamp')}, n.id, s.memory_usage_mb, s.time_in_top5, s.sample_interval
+    FROM process_stats AS s LEFT JOIN process_names AS n ON n.name = s.process_name
+    ORDER BY s.id
+    """)
+
+    conn.execute("""
+    CREATE TABLE process_day_totals_new (
+        date TEXT,
+        name_id INTEGER,
+        time_in_top5_sec REAL,
+        memory_sum_mb REAL,
+        samples INTEGER,
+        PRIMARY KEY (date, name_id)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("""
+    INSERT INTO process_day_totals_new (date, name_id, time_in_top5_sec, memory_sum_mb, samples)
+    SELECT t.date, n.id, t.time_in_top5_sec, t.memory_sum_mb, t.samples
+    FROM process_day_totals AS t LEFT JOIN process_names AS n ON n.name = t.process_name
+    """)
+
+    for tier in ('1m', '1h'):
+        conn.execute(f"""
+        CREATE TABLE process_stats_{tier}_new (
+            bucket INTEGER,
+            name_id INTEGER,
+            memory_min_mb REAL,
+            memory_avg_mb REAL,
+            memory_max_mb REAL,
+            samples INTEGER,
+            time_in_top5_sec REAL,
+            PRIMARY KEY (bucket, name_id)
+        ) WITHOUT ROWID
+        """)
+        conn.execute(f"""
+        INSERT INTO process_stats_{tier}_new
+            (bucket, name_id, memory_min_mb, memory_avg_mb, memory_max_mb, samples, time_in_top5_sec)
+        SELECT {_epoch('t.bucket')}, n.id, t.memory_min_mb, t.memory_avg_mb, t.memory_max_mb,
+               t.samples, t.time_in_top5_sec
+        FROM process_stats_{tier} AS t LEFT JOIN process_names AS n ON n.name = t.process_name
+        """)
+
+    conn.execute("""
+    CREATE TABLE daily_process_stats_new (
+        id INTEGER PRIMARY KEY,
+        date TEXT,
+        name_id INTEGER REFERENCES process_names (id),
+        total_time_in_top5_sec INTEGER,
+        average_memory_mb REAL
+    )
+    """)
+    conn.execute("""
+    INSERT INTO daily_process_stats_new (date, name_id, total_time_in_top5_sec, average_memory_mb)
+    SELECT d.date, n.id, d.total_time_in_top5_sec, d.average_memory_mb
+    FROM daily_process_stats AS d LEFT JOIN process_names AS n ON n.name = d.process_name
+    ORDER BY d.id
+    """)
+
+    conn.execute("""
+    CREATE TABLE daily_summary_new (
+        id INTEGER PRIMARY KEY,
+        date TEXT,
+        name_id INTEGER REFERENCES process_names (id),
+        total_time_in_top5_sec INTEGER,
+        average_memory_mb REAL
+    )
+    """)
+    conn.execute("""
+    INSERT INTO daily_summary_new (date, name_id, total_time_in_top5_sec, average_memory_mb)
+    SELECT d.date, n.id, d.total_time_in_top5_sec, d.average_memory_mb
+    FROM daily_summary AS d LEFT JOIN process_names AS n ON n.name = d.top_process_name
+    ORDER BY d.id
+    """)
+
+    # Tier watermarks become epoch seconds, the day watermark stays a date,
+    # so the column loses its TEXT affinity
+    conn.execute("""
+    CREATE TABLE rollup_state_new (
+        tier TEXT PRIMARY KEY,
+        rolled_until
+    )
+    """)
+    conn.execute(f"""
+    INSERT INTO rollup_state_new (tier, rolled_until)
+    SELECT tier, CASE WHEN tier = 'day' THEN rolled_until ELSE COALESCE({_epoch('rolled_until')}, 0) END
+    FROM rollup_state
+    """)
+
+    for table in ('process_stats', 'process_day_totals', 'process_stats_1m', 'process_stats_1h',
+                  'daily_process_stats', 'daily_summary', 'rollup_state'):
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+    conn.execute("""
+    CREATE INDEX process_stats_by_time
+    ON process_stats (timestamp, name_id, memory_usage_mb, sample_interval)
+    """)
+    conn.execute("""
+    CREATE INDEX daily_process_stats_by_name
+    ON daily_process_stats (name_id, total_time_in_top5_sec)
+    """)
+    conn.execute("""
+    CREATE INDEX daily_summary_by_date
+    ON daily_summary (date, total_time_in_top5_sec)
+    """)
+
+
+# MIGRATIONS[n] upgrades a database at user_version n to n + 1. Append new
+# steps here; never edit one that has shipped.
+MIGRATIONS = [
+    migrate_v1,
+    migrate_v2,
+    migrate_v3,
+    migrate_v4,
+    migrate_v5,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate(conn, legacy_paths=None):
+    """Bring the database up to SCHEMA_VERSION, one transaction per step.
+
+    legacy_paths maps the LEGACY_DBS keys to files that get attached while the
+    migrations run; missing files are skipped.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(f"Stats database is at schema version {version}, "
+                           f"newer than this build ({SCHEMA_VERSION})")
+    if version == SCHEMA_VERSION:
+        return version
+
+    # ATTACH is not allowed inside a transaction, so do it up front
+    attached = []
+    for name, path in (legacy_paths or {}).items():
+        if path and os.path.exists(path):
+            conn.execute(f"ATTACH DATABASE ? AS {name}", (path,))
+            attached.append(name)
+    try:
+        while version < SCHEMA_VERSION:
+            conn.execute("BEGIN")
+            try:
+                MIGRATIONS[version](conn, attached)
+                version += 1
+                conn.execute(f"PRAGMA user_version = {version}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            print(f"Stats database migrated to schema version {version}")
+    finally:
+        for name in attached:
+            conn.execute(f"DETACH DATABASE {name}")
+    return version
+
+
+def enable_incremental_vacuum(conn):
+    """Switch the file to auto_vacuum=INCREMENTAL so space freed by retention
+    can be handed back in small steps instead of a full VACUUM."""
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        # Only takes effect on an existing file after one full VACUUM
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+
+
+class ProcessNames:
+    """name -> process_names.id, cached; only used from the writer thread."""
+
+    def __init__(self):
+        self._ids = {}
+
+    def intern(self, conn, names):
+        """Return {name: id} for names, adding the missing ones.
+
+        New names are committed in their own transaction before the caller's
+        rows are written, so a failed batch can never leave a cached id that
+        was rolled back.
+        """
+        missing = [name for name in set(names) if name not in self._ids]
+        if missing:
+            with conn:
+                conn.executemany("INSERT OR IGNORE INTO process_names (name) VALUES (?)",
+                                 [(name,) for name in missing])
+            for name in missing:
+                self._ids[name] = conn.execute("SELECT id FROM process_names WHERE name = ?", (name,)).fetchone()[0]
+        return self._ids
@@ -0,0 +1,81 @@
+from types import MappingProxyType
+
+import numpy as np
+
+# Column order of the key matrix built in TopKEngine.rank
+RANKING_KEYS = ('memory', 'cpu', 'io', 'gpu_memory', 'combined')
+# Rankings whose key depends on an interval reading
+CPU_KEYS = frozenset({'cpu', 'io', 'combined'})
+
+# Per-view defaults: the usage tracker logs the top 5 by memory, the
+# Processes tab summary names the top CPU and I/O users and the Gaming tab's
+# AI prompt quotes the top 5 by combined score, CPU, I/O and GPU memory.
+DEFAULT_K = {
+    'memory': 5,
+    'cpu': 5,
+    'io': 5,
+    'gpu_memory': 5,
+    'combined': 5,
+}
+
+
+class TopKEngine:
+    """Builds every ranking from one pass over the process snapshot.
+
+    The keys are gathered into a single matrix, then each column is cut to
+    its K largest with argpartition (O(n)) and only those K rows are sorted.
+    """
+
+    def __init__(self, k=None):
+        self.k = dict(DEFAULT_K)
+        if k:
+            self.k.update(k)
+
+    def set_k(self, key, k):
+        if key not in RANKING_KEYS:
+            raise ValueError(f"Unknown ranking key: {key}")
+        self.k[key] = k
+
+    def rank(self, processes, gpu_memory=None):
+        """Return a read-only {key: tuple of ProcessInfo, largest first}.
+
+        gpu_memory maps pid to MB of GPU memory in use; processes missing
+        from it are left out of the gpu_memory ranking.
+        """
+        gpu_memory = gpu_memory or {}
+        if not processes:
+            return MappingProxyType({key: () for key in RANKING_KEYS})
+
+        keys = np.array([
+            (p.memory_mb, p.cpu_percent, p.io_rate, gpu_memory.get(p.pid, -1.0), p.cpu_percent + p.memory_mb / 100)
+            for p in processes
+        ], dtype=np.float64)
+        # Rows without a CPU interval yet carry a placeholder 0%, so they are
+        # left out of every ranking that involves CPU
+        measured = np.flatnonzero([p.measured for p in processes])
+
+        rankings = {}
+        for column, key in enumerate(RANKING_KEYS):
+            if key in CPU_KEYS:
+                indices = measured[_top_indices(keys[measured, column], self.k[key])]
+            elif key == 'gpu_memory':
+                on_gpu = np.flatnonzero(keys[:, column] >= 0)
+                indices = on_gpu[_top_indices(keys[on_gpu, column], self.k[key])]
+            else:
+                indices = _top_indices(keys[:, column], self.k[key])
+            rankings[key] = tuple(processes[i] for i in indices)
+        return MappingProxyType(rankings)
+
+
+def _top_indices(values, k):
+    n = len(values)
+    k = min(k, n)
+    if k <= 0:
+        return []
+    if k < n:
+        candidates = np.argpartition(values, n - k)[n - k:]
+    else:
+        candidates = np.arange(n)
+    # Stable descending order among the K survivors
+    order = np.argsort(-values[candidates], kind='stable')
+    return candidates[order].tolist()
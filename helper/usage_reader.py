@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class UsageQueryThread(QThread):
+    """Loads the Usage-tab chart data off the GUI thread.
+
+    Queries run on the thread's own read-only connection, which under WAL
+    reads the last committed state while the tracker's writer keeps
+    appending. Only the newest request matters: a request arriving while
+    queries are running interrupts them, and results are emitted as
+    {'current': rows, 'overall': rows, 'history': rows, 'memory': rows} only
+    when no newer request is waiting.
+    """
+    results_ready = pyqtSignal(object)
+
+    QUERIES = (
+        ('current', 'fetch_current_day_stats'),
+        ('overall', 'fetch_overall_stats'),
+        ('history', 'fetch_daily_history_stats'),
+        ('memory', 'fetch_peak_memory'),
+    )
+    # Tables those queries read; the memory history comes from a rollup tier
+    TABLES = ('process_day_totals', 'daily_process_stats', 'daily_summary', 'process_stats_1m',
+              'process_stats_1h')
+
+    def __init__(self, tracker, parent=None):
+        super().__init__(parent)
+        self.tracker = tracker
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._conn = None
+        self._requested = 0
+        self._requested_at = None
+        self._running = False
+
+        self.completed = 0
+        self.cancelled = 0
+        self.errors = 0
+        self.last_latency = 0.0
+        self.total_latency = 0.0
+
+    def start(self, *args):
+        self._stop_event.clear()
+        super().start(*args)
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        self.wait()
+
+    def request(self):
+        """Ask for fresh chart data, superseding any request still in flight."""
+        with self._lock:
+            self._requested += 1
+            self._requested_at = time.perf_counter()
+            if self._running:
+                self._conn.interrupt()
+        self._wake_event.set()
+
+    def data_version(self):
+        """Changes whenever a request could return different results."""
+        return self.tracker.current_day, self.tracker.generation(*self.TABLES)
+
+    def _superseded(self, request):
+        return self._requested != request or self._stop_event.is_set()
+
+    def run(self):
+        self._conn = self.tracker.open_reader()
+        try:
+            while True:
+                self._wake_event.wait()
+                self._wake_event.clear()
+                if self._stop_event.is_set():
+                    break
+
+                with self._lock:
+                    request = self._requested
+                    requested_at = self._requested_at
+                    self._running = True
+                results = {}
+                interrupted = False
+                try:
+                    for key, fetch in self.QUERIES:
+                        if self._superseded(request):
+                            break
+                        results[key] = getattr(self.tracker, fetch)(conn=self._conn)
+                except sqlite3.OperationalError as e:
+                    interrupted = 'interrupt' in str(e)
+                    if not interrupted:
+                        self.errors += 1
+                        print(f"Usage query failed: {e}")
+                        continue
+                finally:
+                    with self._lock:
+                        self._running = False
+
+                if interrupted or self._superseded(request):
+                    self.cancelled += 1
+                    # An interrupt can also land on a statement of the newest
+                    # request itself, so always go round again for it
+                    self._wake_event.set()
+                    continue
+
+                self.last_latency = time.perf_counter() - requested_at
+                self.total_latency += self.last_latency
+                self.completed += 1
+                self.results_ready.emit(results)
+        finally:
+            self._conn.close()
+
+    def stats(self):
+        return {
+            'completed': self.completed,
+            'cancelled': self.cancelled,
+            'errors': self.errors,
+            'last_ms': self.last_latency * 1000,
+            'avg_ms': self.total_latency / self.completed * 1000 if self.completed else 0.0,
+        }
@@ -8,9 +8,10 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import QTimer
 
-import GPUtil
 import psutil
 
+from helper.gpu_provider import get_gpu_provider
+
 
 class TrainingSession:
     def __init__(self, model_name):
@@ -140,7 +141,7 @@ class GPUMonitorApp(QWidget):
         self.active_session_label.setText("No active training session.")
 
     def update_gpu_info(self):
-        gpus = GPUtil.getGPUs()
+        gpus = get_gpu_provider().samples()
         if not gpus:
             self.active_session_label.setText("No GPU detected.")
             self.process_table.setRowCount(0)
@@ -148,8 +149,8 @@ class GPUMonitorApp(QWidget):
 
         gpu = gpus[0]  # assuming single GPU, can be extended
 
-        load = gpu.load * 100  # convert to %
-        memory_used = gpu.memoryUsed  # MB
+        load = gpu.load_percent
+        memory_used = gpu.memory_used_mb
 
         # Update active session peaks
         if self.active_session:
@@ -171,16 +172,15 @@ class GPUMonitorApp(QWidget):
         self.update_process_table(gpu)
 
     def update_process_table(self, gpu):
-        procs = getattr(gpu, "processes", None)
-        if procs is None:
-            # fallback: no processes info available from GPUtil
+        procs = gpu.processes
+        if not procs:
             self.process_table.setRowCount(0)
             return
 
         self.process_table.setRowCount(len(procs))
         for i, proc in enumerate(procs):
-            pid = proc['pid']
-            mem_used = proc['used_memory']  # MB
+            pid = proc.pid
+            mem_used = proc.used_memory_mb
             try:
                 p = psutil.Process(pid)
                 name = p.name()
@@ -1,5 +1,4 @@
 import sys
-import GPUtil
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel,
     QTextEdit, QPushButton, QMessageBox, QHBoxLayout
@@ -8,6 +7,8 @@ from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 
 import google.generativeai as genai
 
+from helper.gpu_provider import get_gpu_provider
+
 # Configure your Gemini API key here
 API_KEY = "YOUR_GEMINI_API_KEY"
 genai.configure(api_key=API_KEY)
@@ -15,10 +16,10 @@ model = genai.GenerativeModel("gemini-1.5-pro")
 
 def get_gpu_condition_string():
     """
-    Use GPUtil to fetch GPU stats and return a formatted string describing
-    the current GPU condition.
+    Use the shared GPU provider to fetch GPU stats and return a formatted string
+    describing the current GPU condition.
     """
-    gpus = GPUtil.getGPUs()
+    gpus = get_gpu_provider().samples()
     if not gpus:
         return "No GPU detected."
 
@@ -26,9 +27,9 @@ def get_gpu_condition_string():
     condition = (
         f"GPU Name: {gpu.name}\n"
         f"Temperature: {gpu.temperature}°C\n"
-        f"GPU Load: {gpu.load * 100:.1f}%\n"
-        f"Memory Usage: {gpu.memoryUsed} MB / {gpu.memoryTotal} MB\n"
-        f"Memory Utilization: {gpu.memoryUtil * 100:.1f}%"
+        f"GPU Load: {gpu.load_percent:.1f}%\n"
+        f"Memory Usage: {gpu.memory_used_mb:.0f} MB / {gpu.memory_total_mb:.0f} MB\n"
+        f"Memory Utilization: {gpu.memory_used_mb / gpu.memory_total_mb * 100 if gpu.memory_total_mb else 0:.1f}%"
     )
     return condition
 
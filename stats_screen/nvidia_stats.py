@@ -1,17 +1,9 @@
 import sys
-import GPUtil
 import psutil
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QGridLayout
 from PyQt5.QtCore import QTimer
-from pynvml import *
 
-# Initialize NVML safely
-try:
-    nvmlInit()
-    nvml_available = True
-except NVMLError as err:
-    print(f"Failed to initialize NVML: {err}")
-    nvml_available = False
+from helper.gpu_provider import get_gpu_provider
 
 
 class GPUStatsScreen(QWidget):
@@ -47,66 +39,31 @@ class GPUStatsScreen(QWidget):
         self.timer.start(1000)
 
     def update_stats(self):
-        gpus = GPUtil.getGPUs()
-        if not gpus or not nvml_available:
+        # The shared provider owns the NVML session and device handles
+        gpus = get_gpu_provider().samples()
+        if not gpus:
             for label in self.labels.values():
                 label.setText("GPU not detected.")
             return
 
         gpu = gpus[0]
-        handle = nvmlDeviceGetHandleByIndex(gpu.id)
-
-        try:
-            power = nvmlDeviceGetPowerUsage(handle) / 1000  # W
-        except NVMLError:
-            power = 0
-
-        try:
-            fan_speed = nvmlDeviceGetFanSpeed(handle)
-        except NVMLError:
-            fan_speed = 0
-
-        try:
-            enc_util, _ = nvmlDeviceGetEncoderUtilization(handle)
-        except NVMLError:
-            enc_util = 0
-
-        try:
-            dec_util, _ = nvmlDeviceGetDecoderUtilization(handle)
-        except NVMLError:
-            dec_util = 0
-
-        try:
-            clocks = nvmlDeviceGetClockInfo(handle, NVML_CLOCK_GRAPHICS)
-        except NVMLError:
-            clocks = 0
-
-        try:
-            mem_clocks = nvmlDeviceGetClockInfo(handle, NVML_CLOCK_MEM)
-        except NVMLError:
-            mem_clocks = 0
-
-        try:
-            throttle_reasons = nvmlDeviceGetCurrentClocksThrottleReasons(handle)
-        except NVMLError:
-            throttle_reasons = 0
 
         cpu_usage = psutil.cpu_percent()
         ram = psutil.virtual_memory()
         ram_usage = f"{ram.used // (1024 ** 2)} MB / {ram.total // (1024 ** 2)} MB"
 
         # Update Labels
-        self.labels["GPU Load"].setText(f"{gpu.load * 100:.2f}%")
+        self.labels["GPU Load"].setText(f"{gpu.load_percent:.2f}%")
         self.labels["Temperature"].setText(f"{gpu.temperature}°C")
-        self.labels["Memory Used"].setText(f"{gpu.memoryUsed} MB")
-        self.labels["Memory Total"].setText(f"{gpu.memoryTotal} MB")
-        self.labels["Power Draw"].setText(f"{power:.1f} W")
-        self.labels["Fan Speed"].setText(f"{fan_speed}%")
-        self.labels["Encoder Utilization"].setText(f"{enc_util}%")
-        self.labels["Decoder Utilization"].setText(f"{dec_util}%")
-        self.labels["Core Clock"].setText(f"{clocks} MHz")
-        self.labels["Memory Clock"].setText(f"{mem_clocks} MHz")
-        self.labels["Throttle Reasons"].setText(f"0x{throttle_reasons:X}")
+        self.labels["Memory Used"].setText(f"{gpu.memory_used_mb:.0f} MB")
+        self.labels["Memory Total"].setText(f"{gpu.memory_total_mb:.0f} MB")
+        self.labels["Power Draw"].setText(f"{gpu.power_w:.1f} W")
+        self.labels["Fan Speed"].setText(f"{gpu.fan_speed}%")
+        self.labels["Encoder Utilization"].setText(f"{gpu.encoder_util}%")
+        self.labels["Decoder Utilization"].setText(f"{gpu.decoder_util}%")
+        self.labels["Core Clock"].setText(f"{gpu.core_clock_mhz} MHz")
+        self.labels["Memory Clock"].setText(f"{gpu.memory_clock_mhz} MHz")
+        self.labels["Throttle Reasons"].setText(f"0x{gpu.throttle_reasons:X}")
         self.labels["CPU Usage"].setText(f"{cpu_usage}%")
         self.labels["RAM Usage"].setText(ram_usage)
 